@@ -13,50 +13,84 @@ bl_info = {
 
 import os
 import re
+import json
+import mmap
+import zlib
+import array
+import tempfile
+import bisect
+import heapq
+import itertools
+import time
 import bpy
 import requests
-import urllib.request
 import zipfile
 import webbrowser
+import shutil
+import subprocess
 import threading
+import hashlib
+import cProfile
+import pstats
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from bpy_extras.io_utils import ExportHelper
 import bpy.utils.previews
 
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
 # Global dictionaries and locks for preview downloading
-preview_download_threads = {}
+PREVIEW_WORKERS = 8
+MAX_CONNECTIONS_PER_HOST = 8
+preview_download_futures = {}
 preview_download_lock = threading.Lock()
+preview_executor = None
+http_session = None
+http_session_lock = threading.Lock()
 
 # -------------------------------------------------------------------
-# Initial Asset Fetching (filtering out HDRIs and Substance materials)
+# Initial Asset Fetching (materials only)
 # -------------------------------------------------------------------
 assets = []
-ASSET_LIST_URL = (
-    "https://ambientcg.com/hx/asset-list?id=&childrenOf=&variationsOf=&parentsOf="
-    "&q=ball&colorMode=&thumbnails=200&sort=popular"
+# Overridable so batch jobs and benchmarks can run against a local mirror
+AMBIENTCG_URL = os.environ.get("AMBIENTCG_URL", "https://ambientcg.com").rstrip("/")
+CATALOG_API_URL = f"{AMBIENTCG_URL}/api/v2/full_json"
+SEARCH_SORT = "Popular"
+STARTUP_QUERY = "ball"
+STARTUP_CATALOG_SIZE = 100
+REQUEST_TIMEOUT = 30
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/91.0.4472.124 Safari/537.36"
 )
-response = requests.get(ASSET_LIST_URL)
-asset_pattern = re.compile(r'<div class="asset-block" id="asset-([^"]+)">')
-link_pattern  = re.compile(r'<a\s+href="(/view\?id=[^"]+)">')
-img_pattern   = re.compile(r'<img[^>]+class="only-show-dark"[^>]+src="([^"]+)"')
-for match in zip(asset_pattern.finditer(response.text),
-                 link_pattern.finditer(response.text),
-                 img_pattern.finditer(response.text)):
-    asset_id = match[0].group(1)
-    # Skip HDRIs and Substance materials
-    if "hdri" in asset_id.lower() or "substance" in asset_id.lower():
-        continue
-    asset_link = match[1].group(1)
-    asset_img = match[2].group(1)
-    assets.append((asset_id, asset_link, asset_img))
+# The startup catalog is served from this snapshot and refreshed once it is older than the TTL
+CATALOG_SNAPSHOT_NAME = "catalog.json"
+CATALOG_TTL = 24 * 60 * 60
+# Token index over every asset seen, kept next to the snapshot
+CATALOG_INDEX_NAME = "catalog_index.json"
+catalog_refreshing = False
+catalog_refresh_thread = None
+catalog_refresh_result = None
+catalog_refresh_error = None
 
 downloaded_assets = {}
-preload_queue = []
-preload_operator_running = False
 search_query = ""
 original_assets = assets.copy()
+# False once a search has replaced the startup catalog
+showing_startup_catalog = True
 current_page = 1
 total_pages = 1
 items_per_page = 20
+# Page of `assets` shown in the panel, and the precomputed rows it draws from
+view_page = 1
+draw_model = []
 preview_collections = {}
 
 # -------------------------------------------------------------------
@@ -75,40 +109,797 @@ class URL_OT_Open(bpy.types.Operator):
 # -------------------------------------------------------------------
 # Utility functions
 # -------------------------------------------------------------------
+def get_http_session():
+    # One keep-alive session shared by every worker so TLS connections get reused
+    global http_session
+    with http_session_lock:
+        if http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONNECTIONS_PER_HOST, pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            http_session = session
+        return http_session
+
+def get_preview_executor():
+    global preview_executor
+    with preview_download_lock:
+        if preview_executor is None:
+            preview_executor = ThreadPoolExecutor(max_workers=PREVIEW_WORKERS, thread_name_prefix="ambientcg-preview")
+        return preview_executor
+
+# Set from the add-on preferences on the main thread so workers never read bpy
+shared_cache_root = ""
+
 def get_cache_dir():
-    home = Path.home()
-    cache_dir = home / ".cache" / "ambientcg"
+    override = os.environ.get("AMBIENTCG_CACHE_DIR") or shared_cache_root
+    cache_dir = Path(override) if override else Path.home() / ".cache" / "ambientcg"
     cache_dir.mkdir(parents=True, exist_ok=True)
     return cache_dir
 
-def fetch_and_create_material(material_name, resolution):
-    url = f"https://ambientcg.com/get?file={material_name}_{resolution}-PNG.zip"
+def redraw_panels():
+    wm = bpy.context.window_manager
+    if wm is None:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+# -------------------------------------------------------------------
+# Shared cache (cross-process locks, atomic writes, content verification)
+# -------------------------------------------------------------------
+# The cache dir may live on NFS/SMB and be used by many Blender processes at once:
+# every cache entry is created under "<key>.lock", and everything is written to a
+# private temporary name first so readers never see a half written file
+CACHE_LOCK_TIMEOUT = 15 * 60
+# The UI never waits longer than this for another process; the work goes to a worker instead
+MAIN_THREAD_LOCK_TIMEOUT = 1.0
+CACHE_LOCK_POLL = 0.1
+VERIFY_SUFFIX = ".verify"
+VERIFY_NAME = "verify.json"
+HASH_BUFFER_SIZE = 1024 * 1024
+# POSIX record locks belong to the process, so threads serialize on these first
+thread_locks = {}
+thread_locks_lock = threading.Lock()
+# Archives this process downloaded or has already rehashed: path -> (size, mtime_ns)
+hashed_archives = {}
+
+def temp_path_for(path):
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+class CacheLock:
+    # Exclusive lock shared by threads and processes; fcntl record locks are forwarded
+    # to NFS servers and msvcrt byte-range locks to SMB shares
+    def __init__(self, name, timeout=CACHE_LOCK_TIMEOUT, cancel_event=None):
+        self.path = get_cache_dir() / f"{name}.lock"
+        self.timeout = timeout
+        self.cancel_event = cancel_event
+        with thread_locks_lock:
+            self.thread_lock = thread_locks.setdefault(str(self.path), threading.Lock())
+        self.handle = None
+
+    def check_wait(self, deadline):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise DownloadCancelled()
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Timed out waiting for {self.path.name}")
+
+    def try_lock(self):
+        try:
+            if os.name == "nt":
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.lockf(self.handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def is_current(self):
+        # The previous holder may have deleted the file while we waited on it
+        try:
+            return os.stat(self.path).st_ino == os.fstat(self.handle.fileno()).st_ino
+        except OSError:
+            return False
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while not self.thread_lock.acquire(timeout=CACHE_LOCK_POLL):
+            self.check_wait(deadline)
+        try:
+            self.handle = open(self.path, "a+b")
+            while True:
+                if self.try_lock():
+                    if self.is_current():
+                        return self
+                    # Locked a deleted file: start over on the one that replaced it
+                    self.handle.close()
+                    self.handle = open(self.path, "a+b")
+                    continue
+                self.check_wait(deadline)
+                time.sleep(CACHE_LOCK_POLL)
+        except BaseException:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+            self.thread_lock.release()
+            raise
+
+    def release(self, remove=False):
+        # remove: delete the lock file too, once the entry it guards is gone
+        try:
+            if remove and os.name != "nt":
+                # Waiters see the file is gone once they get the lock and open a new one
+                try:
+                    self.path.unlink()
+                except OSError:
+                    pass
+            if os.name == "nt":
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.lockf(self.handle, fcntl.LOCK_UN)
+        finally:
+            self.handle.close()
+            self.handle = None
+            if remove and os.name == "nt":
+                # Windows refuses while another process has the file open, so no waiter is stranded
+                try:
+                    self.path.unlink()
+                except OSError:
+                    pass
+            self.thread_lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+def file_sha256(path, hasher=None):
+    hasher = hasher or hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BUFFER_SIZE), b""):
+            hasher.update(block)
+    return hasher
+
+def write_json_atomic(path, data):
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def remember_hashed_archive(zip_path):
+    stat = os.stat(zip_path)
+    with thread_locks_lock:
+        hashed_archives[str(zip_path)] = (stat.st_size, stat.st_mtime_ns)
+
+def write_archive_record(zip_path, sha256):
+    zip_path = Path(zip_path)
+    write_json_atomic(zip_path.with_name(zip_path.name + VERIFY_SUFFIX),
+                      {"size": zip_path.stat().st_size, "sha256": sha256})
+    remember_hashed_archive(zip_path)
+
+def archive_is_valid(zip_path, full=False):
+    # Size check by default. full=True also checks the SHA-256 of archives this process
+    # didn't download itself (another process sharing the cache did), once per file
+    zip_path = Path(zip_path)
+    try:
+        stat = zip_path.stat()
+    except OSError:
+        return False
+    record = read_json(zip_path.with_name(zip_path.name + VERIFY_SUFFIX))
+    if not isinstance(record, dict):
+        # Archives cached before verification existed
+        return zipfile.is_zipfile(zip_path)
+    if record.get("size") != stat.st_size:
+        return False
+    if not full:
+        return True
+    with thread_locks_lock:
+        if hashed_archives.get(str(zip_path)) == (stat.st_size, stat.st_mtime_ns):
+            return True
+    if file_sha256(zip_path).hexdigest() != record.get("sha256"):
+        return False
+    remember_hashed_archive(zip_path)
+    return True
+
+def record_extracted_files(extract_path, files):
+    verify_path = Path(extract_path) / VERIFY_NAME
+    sizes = read_json(verify_path) or {}
+    for path in files:
+        sizes[os.path.basename(path)] = os.path.getsize(path)
+    write_json_atomic(verify_path, sizes)
+
+def verified_files(extract_path, names):
+    # Drops files whose size doesn't match what was extracted
+    sizes = read_json(Path(extract_path) / VERIFY_NAME)
+    if not isinstance(sizes, dict):
+        return names
+    verified = {}
+    for map_name, name in names.items():
+        try:
+            if name not in sizes or os.path.getsize(Path(extract_path) / name) == sizes[name]:
+                verified[map_name] = name
+        except OSError:
+            pass
+    return verified
+
+# -------------------------------------------------------------------
+# Instrumentation (stage timings, counters and cache hit rates)
+# -------------------------------------------------------------------
+# Histogram bucket upper bounds; the last bucket collects everything slower
+TIMING_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# Percentiles are computed over the most recent samples of each stage
+TIMING_SAMPLE_LIMIT = 512
+profile_next_import = False
+last_profile_path = None
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+class Metrics:
+    # Recorded from download and preview workers as well as the main thread
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.stages = {}
+        self.started = time.time()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {}
+            self.stages = {}
+            self.started = time.time()
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def cache_lookup(self, cache, hit):
+        self.count(f"{cache}.{'hits' if hit else 'misses'}")
+
+    def record(self, stage, seconds, nbytes=0):
+        with self.lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = {
+                    "count": 0, "total": 0.0, "max": 0.0, "bytes": 0,
+                    "buckets": [0] * (len(TIMING_BUCKETS_MS) + 1),
+                    "samples": deque(maxlen=TIMING_SAMPLE_LIMIT),
+                }
+            entry["count"] += 1
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["bytes"] += nbytes
+            entry["buckets"][bisect.bisect_left(TIMING_BUCKETS_MS, seconds * 1000)] += 1
+            entry["samples"].append(seconds)
+
+    @contextmanager
+    def measure(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - started)
+
+    @staticmethod
+    def hit_rates(counters):
+        rates = {}
+        caches = {name.rsplit(".", 1)[0] for name in counters if name.endswith((".hits", ".misses"))}
+        for cache in sorted(caches):
+            hits = counters.get(f"{cache}.hits", 0)
+            lookups = hits + counters.get(f"{cache}.misses", 0)
+            rates[cache] = {"hits": hits, "lookups": lookups, "rate": hits / lookups}
+        return rates
+
+    def snapshot(self):
+        with self.lock:
+            counters = dict(self.counters)
+            stages = {}
+            for stage, entry in sorted(self.stages.items()):
+                ordered = sorted(entry["samples"])
+                summary = {
+                    "count": entry["count"],
+                    "total_s": entry["total"],
+                    "mean_ms": entry["total"] / entry["count"] * 1000,
+                    "p50_ms": percentile(ordered, 50) * 1000,
+                    "p90_ms": percentile(ordered, 90) * 1000,
+                    "p99_ms": percentile(ordered, 99) * 1000,
+                    "max_ms": entry["max"] * 1000,
+                    "histogram_ms": {
+                        (f"<={bound}" if i < len(TIMING_BUCKETS_MS) else f">{TIMING_BUCKETS_MS[-1]}"): n
+                        for i, (bound, n) in enumerate(zip(TIMING_BUCKETS_MS + (None,), entry["buckets"]))
+                    },
+                }
+                if entry["bytes"]:
+                    summary["bytes"] = entry["bytes"]
+                    summary["mb_per_s"] = entry["bytes"] / (1024 * 1024) / max(entry["total"], 1e-9)
+                stages[stage] = summary
+            return {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "uptime_s": time.time() - self.started,
+                "counters": counters,
+                "caches": self.hit_rates(counters),
+                "stages": stages,
+            }
+
+metrics = Metrics()
+
+def profile_call(label, fn, *args, **kwargs):
+    # Runs fn under cProfile when a capture was armed from the stats panel, otherwise just calls it
+    global profile_next_import, last_profile_path
+    if not profile_next_import:
+        return fn(*args, **kwargs)
+    profile_next_import = False
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        path = get_cache_dir() / f"profile_{label}_{time.strftime('%Y%m%d-%H%M%S')}.prof"
+        profiler.dump_stats(str(path))
+        last_profile_path = str(path)
+        print(f"Import profile written to {path}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+# -------------------------------------------------------------------
+# AmbientCG catalog client (JSON API, one pass over the results)
+# -------------------------------------------------------------------
+# resolutions holds the download variants the asset offers, e.g. ("1K-JPG", "1K-PNG", ...)
+AssetRecord = namedtuple(
+    "AssetRecord",
+    ["id", "link", "thumbnail", "type", "resolutions", "tags", "category"],
+    defaults=("", (), (), ""),
+)
+def to_asset_record(row):
+    # Rows read back from JSON carry lists where records use tuples
+    record = AssetRecord(*row)
+    return record._replace(resolutions=tuple(record.resolutions), tags=tuple(record.tags))
+
+# Everything else (HDRIs, Substance files, 3D models, ...) can't be built by this addon
+IMPORTABLE_DATA_TYPES = {"Material"}
+PREVIEW_IMAGE_KEYS = ("256-PNG", "256-JPG-242424", "128-PNG", "512-PNG")
+
+class CatalogClient:
+    def __init__(self, api_url=CATALOG_API_URL):
+        self.api_url = api_url
+
+    def build_params(self, query, offset, count, sort):
+        return {
+            "q": query,
+            "type": ",".join(sorted(IMPORTABLE_DATA_TYPES)),
+            "sort": sort,
+            "limit": count,
+            "offset": offset,
+            "include": "tagData,previewData,downloadData,displayData",
+        }
+
+    def search(self, query, offset=0, count=20, sort=SEARCH_SORT):
+        # Returns (records, total_results)
+        with metrics.measure("catalog.fetch"):
+            response = get_http_session().get(
+                self.api_url, params=self.build_params(query, offset, count, sort), timeout=REQUEST_TIMEOUT
+            )
+            response.raise_for_status()
+            data = response.json()
+        with metrics.measure("catalog.parse"):
+            return self.parse(data)
+
+    @staticmethod
+    def parse_record(found):
+        asset_id = found.get("assetId")
+        if not asset_id:
+            return None
+        data_type = found.get("dataType", "")
+        previews = found.get("previewImage") or {}
+        thumbnail = next((previews[key] for key in PREVIEW_IMAGE_KEYS if key in previews), "")
+        if not thumbnail and previews:
+            thumbnail = next(iter(previews.values()))
+        resolutions = []
+        for folder in (found.get("downloadFolders") or {}).values():
+            categories = folder.get("downloadFiletypeCategories") or {}
+            for download in (categories.get("zip") or {}).get("downloads", ()):
+                attribute = download.get("attribute")
+                if attribute and attribute not in resolutions:
+                    resolutions.append(attribute)
+        return AssetRecord(
+            asset_id,
+            f"/view?id={asset_id}",
+            thumbnail,
+            data_type,
+            tuple(resolutions),
+            tuple(found.get("tags") or ()),
+            found.get("displayCategory") or found.get("category") or "",
+        )
+
+    @classmethod
+    def parse(cls, data):
+        records = []
+        for found in data.get("foundAssets", ()):
+            record = cls.parse_record(found)
+            if record is not None and record.type in IMPORTABLE_DATA_TYPES:
+                records.append(record)
+        return records, int(data.get("numberOfResults") or 0)
+
+catalog_client = None
+
+def get_catalog_client():
+    global catalog_client
+    if catalog_client is None:
+        catalog_client = CatalogClient()
+    return catalog_client
+
+# -------------------------------------------------------------------
+# Selective extraction of the texture maps we actually use
+# -------------------------------------------------------------------
+REQUIRED_MAPS = ("Color", "Roughness", "NormalGL", "Displacement")
+OPTIONAL_MAPS = ("Metalness", "AmbientOcclusion")
+MAP_EXTENSIONS = (".png", ".jpg", ".jpeg", ".exr")
+ARCHIVE_MAPS_NAME = "archive_maps.json"
+# Texture nodes are named after their map so progressive imports can find them again
+TEXTURE_NODE_PREFIX = "AmbientCG "
+PROGRESSIVE_RESOLUTION = "1K"
+EXTRACT_WORKERS = 4
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+def get_wanted_maps():
+    prefs = get_addon_prefs()
+    wanted = list(REQUIRED_MAPS)
+    if prefs is None or prefs.import_metalness:
+        wanted.append("Metalness")
+    if prefs is not None and prefs.import_ambient_occlusion:
+        wanted.append("AmbientOcclusion")
+    return wanted
+
+def map_name_for(filename):
+    # "Bricks059_1K_Color.png" -> "Color"
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    if ext.lower() not in MAP_EXTENSIONS or "_" not in stem:
+        return None
+    return stem.rsplit("_", 1)[1]
+
+def member_rank(filename, map_name, prefer_exr):
+    # Lower wins: 8-bit maps, unless EXR displacement was asked for
+    if not filename.lower().endswith(".exr"):
+        return 1
+    return 0 if prefer_exr and map_name == "Displacement" else 2
+
+def pick_map_files(names, prefer_exr=False):
+    # Best ranked file per map; ties go to the alphabetically first name
+    found = {}
+    for name in sorted(names):
+        map_name = map_name_for(name)
+        if map_name and (map_name not in found or member_rank(name, map_name, prefer_exr) <
+                         member_rank(found[map_name], map_name, prefer_exr)):
+            found[map_name] = name
+    return found
+
+def find_map_files(extract_path, prefer_exr=False):
+    try:
+        return pick_map_files(os.listdir(extract_path), prefer_exr)
+    except OSError:
+        return {}
+
+def read_archive_maps(extract_path):
+    try:
+        with open(Path(extract_path) / ARCHIVE_MAPS_NAME, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def get_missing_maps(extract_path, wanted_maps, prefer_exr=False):
+    # A map also counts as missing when the archive has a better variant than the one extracted
+    present = verified_files(extract_path, find_map_files(extract_path, prefer_exr))
+    available = read_archive_maps(extract_path)
+    if available is None:
+        # Folders extracted before selective extraction hold the whole archive
+        return [] if present else list(wanted_maps)
+    # Newer folders record the archive's file names, older ones only its map names
+    best = pick_map_files(available, prefer_exr)
+    return [m for m in wanted_maps
+            if (m in best and present.get(m) != best[m]) or (m in available and m not in present)]
+
+def extract_member(zip_path, member, dest_path):
+    # Each worker opens its own handle: ZipFile objects are not thread-safe
+    tmp_path = temp_path_for(dest_path)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        with zip_ref.open(member) as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+def extract_maps(zip_path, extract_path, wanted_maps, prefer_exr=False):
+    extract_path = Path(extract_path)
+    extract_path.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        names = [info.filename for info in zip_ref.infolist() if not info.is_dir() and map_name_for(info.filename)]
+    members = pick_map_files(names, prefer_exr)
+    wanted = [members[m] for m in wanted_maps if m in members]
+    if len(wanted) > 1:
+        with ThreadPoolExecutor(max_workers=min(EXTRACT_WORKERS, len(wanted))) as executor:
+            futures = [executor.submit(extract_member, zip_path, member, extract_path / os.path.basename(member))
+                       for member in wanted]
+            written = [future.result() for future in futures]
+    else:
+        written = [extract_member(zip_path, member, extract_path / os.path.basename(member)) for member in wanted]
+    record_extracted_files(extract_path, written)
+    write_json_atomic(extract_path / ARCHIVE_MAPS_NAME, sorted(os.path.basename(name) for name in names))
+    return written
+
+# -------------------------------------------------------------------
+# Texture formats and import-time conversion
+# -------------------------------------------------------------------
+TEXTURE_FORMATS = ("PNG", "JPG")
+CONVERTED_MARKER_NAME = "converted.json"
+# Runs inside a background Blender process: args are source dir, target dir, max size, files
+CONVERT_SCRIPT = """
+import os, sys, json, bpy
+args = sys.argv[sys.argv.index("--") + 1:]
+source_dir, target_dir, max_size, names = args[0], args[1], int(args[2]), args[3:]
+os.makedirs(target_dir, exist_ok=True)
+for name in names:
+    image = bpy.data.images.load(os.path.join(source_dir, name))
+    width, height = image.size
+    if max(width, height) > max_size:
+        scale = max_size / max(width, height)
+        image.scale(max(1, round(width * scale)), max(1, round(height * scale)))
+    image.filepath_raw = os.path.join(target_dir, name)
+    image.save()
+    bpy.data.images.remove(image)
+with open(os.path.join(target_dir, "converted.json"), "w") as f:
+    json.dump({"max_size": max_size, "files": names}, f)
+"""
+conversion_jobs = []
+
+def get_asset_key(asset_name, resolution, fmt="PNG"):
+    # PNG keeps the original cache layout so existing downloads stay valid
+    if fmt == "PNG":
+        return f"{asset_name}_{resolution}"
+    return f"{asset_name}_{resolution}-{fmt}"
+
+def get_texture_format():
+    prefs = get_addon_prefs()
+    return prefs.texture_format if prefs else "PNG"
+
+def resolve_texture_format(asset_name, resolution, fmt=None):
+    # The preferred format, unless the catalog says this asset doesn't offer it
+    fmt = fmt or get_texture_format()
+    record = get_catalog_index().records.get(asset_name)
+    if record is None or not record.resolutions or f"{resolution}-{fmt}" in record.resolutions:
+        return fmt
+    for other in TEXTURE_FORMATS:
+        if f"{resolution}-{other}" in record.resolutions:
+            return other
+    return fmt
+
+def texture_format_changed(self, context):
+    # Download keys shown in the panel depend on the format
+    rebuild_draw_model(keep_page=True)
+
+def prefer_exr_displacement():
+    prefs = get_addon_prefs()
+    return bool(prefs and prefs.prefer_exr_displacement)
+
+def get_convert_size():
+    prefs = get_addon_prefs()
+    return int(prefs.convert_max_size) if prefs and prefs.convert_max_size != "OFF" else 0
+
+def get_texture_source(extract_path):
+    # Returns (folder to build from, converted folder still to be produced or None)
+    max_size = get_convert_size()
+    if not max_size:
+        return extract_path, None
+    converted_path = Path(extract_path) / f"converted_{max_size}"
+    if (converted_path / CONVERTED_MARKER_NAME).exists():
+        return converted_path, None
+    return extract_path, converted_path
+
+def start_conversion(extract_path, converted_path, material_name, asset_id, resolution, fmt):
+    # Downscales in a separate Blender process; the material is swapped over when it finishes
+    for job in conversion_jobs:
+        if job["converted_path"] == converted_path:
+            job["materials"].append(material_name)
+            return
+    names = sorted(find_map_files(extract_path, prefer_exr_displacement()).values())
+    if not names:
+        return
+    max_size = int(converted_path.name.rsplit("_", 1)[1])
+    try:
+        process = subprocess.Popen(
+            [bpy.app.binary_path, "-b", "--factory-startup", "--python-expr", CONVERT_SCRIPT,
+             "--", str(extract_path), str(converted_path), str(max_size), *names],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        print(f"Failed to start texture conversion: {e}")
+        return
+    conversion_jobs.append({
+        "process": process, "converted_path": converted_path, "materials": [material_name],
+        "asset_id": asset_id, "resolution": resolution, "fmt": fmt,
+    })
+    if not bpy.app.timers.is_registered(poll_conversions):
+        bpy.app.timers.register(poll_conversions, first_interval=1.0)
+
+def poll_conversions():
+    for job in list(conversion_jobs):
+        if job["process"].poll() is None:
+            continue
+        conversion_jobs.remove(job)
+        if job["process"].returncode != 0 or not (job["converted_path"] / CONVERTED_MARKER_NAME).exists():
+            print(f"Texture conversion failed for {job['asset_id']} ({job['resolution']})")
+            continue
+        for name in job["materials"]:
+            mat = bpy.data.materials.get(name)
+            if mat is not None:
+                swap_material_textures(mat, job["asset_id"], job["resolution"], job["converted_path"], fmt=job["fmt"])
+        get_cache_manager().touch(job["converted_path"].parent.name)
+    return 1.0 if conversion_jobs else None
+
+# -------------------------------------------------------------------
+# Catalog snapshot and background refresh
+# -------------------------------------------------------------------
+def load_catalog_snapshot():
+    # Returns (assets, is_fresh); an unreadable snapshot counts as stale
+    snapshot_path = get_cache_dir() / CATALOG_SNAPSHOT_NAME
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        snapshot_assets = [to_asset_record(asset) for asset in data["assets"]]
+        is_fresh = time.time() - data.get("fetched_at", 0) < CATALOG_TTL
+        return snapshot_assets, is_fresh
+    except (OSError, ValueError, KeyError, TypeError):
+        return [], False
+
+def save_catalog_snapshot(snapshot_assets):
+    snapshot_path = get_cache_dir() / CATALOG_SNAPSHOT_NAME
+    try:
+        write_json_atomic(snapshot_path, {"fetched_at": time.time(), "assets": snapshot_assets})
+    except OSError as e:
+        print(f"Failed to write catalog snapshot: {e}")
+
+def catalog_refresh_worker():
+    # Runs off the main thread: never touch bpy here
+    global catalog_refresh_result, catalog_refresh_error
+    try:
+        fetched, _ = get_catalog_client().search(STARTUP_QUERY, 0, STARTUP_CATALOG_SIZE)
+        save_catalog_snapshot(fetched)
+        catalog_refresh_result = fetched
+    except Exception as e:
+        catalog_refresh_error = str(e)
+        print(f"Failed to refresh AmbientCG catalog: {e}")
+
+def refresh_catalog_async():
+    global catalog_refreshing, catalog_refresh_thread, catalog_refresh_result, catalog_refresh_error
+    if catalog_refreshing:
+        return
+    catalog_refreshing = True
+    catalog_refresh_result = None
+    catalog_refresh_error = None
+    catalog_refresh_thread = threading.Thread(target=catalog_refresh_worker)
+    catalog_refresh_thread.daemon = True
+    catalog_refresh_thread.start()
+    bpy.app.timers.register(apply_catalog_refresh, first_interval=0.5)
+
+def apply_catalog_refresh():
+    # Timer callback: hands the worker's result over to the main thread
+    global original_assets, catalog_refreshing, catalog_refresh_thread
+    if catalog_refresh_thread is not None and catalog_refresh_thread.is_alive():
+        return 0.5
+    catalog_refreshing = False
+    catalog_refresh_thread = None
+    # Don't clobber results of a search the user ran while we were refreshing
+    if catalog_refresh_result is not None:
+        index_assets(catalog_refresh_result)
+    if catalog_refresh_result is not None and showing_startup_catalog:
+        original_assets = list(catalog_refresh_result)
+        update_asset_search("")
+    redraw_panels()
+    return None
+
+def fetch_and_create_material(material_name, resolution, maps=None, fmt=None, prefer_exr=None,
+                              lock_timeout=CACHE_LOCK_TIMEOUT):
+    # Safe to call from worker threads when maps, fmt and prefer_exr are given: nothing reads bpy then.
+    # The main thread passes a short lock_timeout so a busy shared cache can't freeze the UI
+    fmt = fmt or resolve_texture_format(material_name, resolution)
+    url = get_asset_url(material_name, resolution, fmt)
     cache_dir = get_cache_dir()
-    extract_path = cache_dir / f"{material_name}_{resolution}"
-    zip_path = cache_dir / f"{material_name}_{resolution}.zip"
-    if not extract_path.exists():
-        if not zip_path.exists():
-            opener = urllib.request.build_opener()
-            opener.addheaders = [
-                ("User-Agent",
-                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                 "AppleWebKit/537.36 (KHTML, like Gecko) "
-                 "Chrome/91.0.4472.124 Safari/537.36")
-            ]
-            urllib.request.install_opener(opener)
-            try:
-                urllib.request.urlretrieve(url, zip_path)
-            except Exception as e:
-                return f"Failed to download file: {str(e)}"
+    asset_key = get_asset_key(material_name, resolution, fmt)
+    extract_path = cache_dir / asset_key
+    zip_path = cache_dir / f"{asset_key}.zip"
+    wanted_maps = get_wanted_maps() if maps is None else maps
+    if prefer_exr is None:
+        prefer_exr = prefer_exr_displacement()
+    missing_maps = get_missing_maps(extract_path, wanted_maps, prefer_exr)
+    metrics.cache_lookup("textures", not missing_maps)
+    if not missing_maps:
+        get_cache_manager().touch(extract_path.name)
+        return extract_path
+    try:
+        with CacheLock(asset_key, timeout=lock_timeout):
+            # Another process sharing the cache may have finished this asset while we waited
+            missing_maps = get_missing_maps(extract_path, wanted_maps, prefer_exr)
+            if missing_maps:
+                error = fill_cache_entry(url, zip_path, extract_path, missing_maps, prefer_exr)
+                if error:
+                    return error
+    except TimeoutError as e:
+        return f"Failed to lock cache entry: {str(e)}"
+    return extract_path
+
+def fill_cache_entry(url, zip_path, extract_path, missing_maps, prefer_exr, job=None, limiter=None):
+    # Call with the entry's CacheLock held; returns an error message or None
+    has_archive = archive_is_valid(zip_path, full=True)
+    metrics.cache_lookup("archives", has_archive)
+    if not has_archive:
+        if job is not None:
+            job.state = "downloading"
         try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(extract_path)
-            zip_path.unlink()
+            download_file(url, zip_path, job, limiter)
+        except DownloadCancelled:
+            raise
         except Exception as e:
-            return f"Failed to extract zip file: {str(e)}"
-    return extract_path
+            return f"Failed to download file: {str(e)}"
+    if job is not None:
+        job.state = "extracting"
+    try:
+        # The zip is kept so that changing the map selection later needs no new download
+        with metrics.measure("extract"):
+            extract_maps(zip_path, extract_path, missing_maps, prefer_exr)
+    except zipfile.BadZipFile as e:
+        # Never trust a broken archive on the next attempt
+        zip_path.unlink()
+        return f"Failed to extract zip file: {str(e)}"
+    except Exception as e:
+        return f"Failed to extract zip file: {str(e)}"
+    get_cache_manager().record(zip_path.name, "textures")
+    get_cache_manager().record(extract_path.name, "textures")
+    return None
 
-def create_material_from_extracted(extract_path, asset_name):
+def prepare_cache_entry(job, limiter=None):
+    # Worker side of an import: downloads and extracts under the entry's lock, so the main
+    # thread only builds materials from finished folders and never waits on other processes
+    extract_path = job.zip_path.parent / job.key
+    with CacheLock(job.key, cancel_event=job.cancel_event):
+        missing_maps = get_missing_maps(extract_path, job.maps, job.prefer_exr)
+        if missing_maps:
+            error = fill_cache_entry(job.url, job.zip_path, extract_path, missing_maps, job.prefer_exr, job, limiter)
+            if error:
+                raise IOError(error)
+
+def is_import_ready(material_name, resolution, maps=None, fmt=None, prefer_exr=None):
+    # True when the maps are already extracted: the material can be built right away
+    cache_dir = get_cache_dir()
+    asset_key = get_asset_key(material_name, resolution, fmt or resolve_texture_format(material_name, resolution))
+    wanted_maps = get_wanted_maps() if maps is None else maps
+    if prefer_exr is None:
+        prefer_exr = prefer_exr_displacement()
+    return not get_missing_maps(cache_dir / asset_key, wanted_maps, prefer_exr)
+
+def load_image(path):
+    started = time.perf_counter()
+    image = bpy.data.images.load(str(path), check_existing=True)
+    metrics.record("images.load", time.perf_counter() - started)
+    return image
+
+def create_material_from_extracted(extract_path, asset_name, maps=None, prefer_exr=None):
+    wanted_maps = get_wanted_maps() if maps is None else maps
+    if prefer_exr is None:
+        prefer_exr = prefer_exr_displacement()
+    files = {m: f for m, f in find_map_files(extract_path, prefer_exr).items() if m in wanted_maps}
     material = bpy.data.materials.new(name=asset_name)
     material.use_nodes = True
     nodes = material.node_tree.nodes
@@ -119,209 +910,1956 @@ def create_material_from_extracted(extract_path, asset_name):
     principled = nodes.new(type="ShaderNodeBsdfPrincipled")
     principled.location = (0, 0)
     links.new(principled.outputs["BSDF"], material_output.inputs["Surface"])
-    for file in os.listdir(extract_path):
-        file_path = extract_path / file
-        if file.endswith("_Color.png"):
-            color_tex = nodes.new(type="ShaderNodeTexImage")
-            color_tex.location = (-600, 300)
-            color_tex.image = bpy.data.images.load(str(file_path))
-            color_tex.image.colorspace_settings.name = "sRGB"
-            links.new(color_tex.outputs["Color"], principled.inputs["Base Color"])
-        elif file.endswith("_Roughness.png"):
-            roughness_tex = nodes.new(type="ShaderNodeTexImage")
-            roughness_tex.location = (-600, 0)
-            roughness_tex.image = bpy.data.images.load(str(file_path))
-            roughness_tex.image.colorspace_settings.name = "Non-Color"
-            links.new(roughness_tex.outputs["Color"], principled.inputs["Roughness"])
-        elif file.endswith("_NormalGL.png"):
-            normal_tex = nodes.new(type="ShaderNodeTexImage")
-            normal_tex.location = (-600, -300)
-            normal_tex.image = bpy.data.images.load(str(file_path))
-            normal_tex.image.colorspace_settings.name = "Non-Color"
-            normal_map = nodes.new(type="ShaderNodeNormalMap")
-            normal_map.location = (-300, -300)
-            links.new(normal_tex.outputs["Color"], normal_map.inputs["Color"])
-            links.new(normal_map.outputs["Normal"], principled.inputs["Normal"])
-        elif file.endswith("_Displacement.png"):
-            displacement_tex = nodes.new(type="ShaderNodeTexImage")
-            displacement_tex.location = (-600, -600)
-            displacement_tex.image = bpy.data.images.load(str(file_path))
-            displacement_tex.image.colorspace_settings.name = "Non-Color"
-            displacement = nodes.new(type="ShaderNodeDisplacement")
-            displacement.location = (-300, -600)
-            links.new(displacement_tex.outputs["Color"], displacement.inputs["Height"])
-            links.new(displacement.outputs["Displacement"], material_output.inputs["Displacement"])
+    if "Color" in files:
+        color_tex = nodes.new(type="ShaderNodeTexImage")
+        color_tex.name = TEXTURE_NODE_PREFIX + "Color"
+        color_tex.location = (-600, 300)
+        color_tex.image = load_image(extract_path / files["Color"])
+        color_tex.image.colorspace_settings.name = "sRGB"
+        color_output = color_tex.outputs["Color"]
+        if "AmbientOcclusion" in files:
+            ao_tex = nodes.new(type="ShaderNodeTexImage")
+            ao_tex.name = TEXTURE_NODE_PREFIX + "AmbientOcclusion"
+            ao_tex.location = (-900, 450)
+            ao_tex.image = load_image(extract_path / files["AmbientOcclusion"])
+            ao_tex.image.colorspace_settings.name = "Non-Color"
+            ao_mix = nodes.new(type="ShaderNodeMixRGB")
+            ao_mix.location = (-300, 300)
+            ao_mix.blend_type = "MULTIPLY"
+            ao_mix.inputs["Fac"].default_value = 1.0
+            links.new(color_output, ao_mix.inputs["Color1"])
+            links.new(ao_tex.outputs["Color"], ao_mix.inputs["Color2"])
+            color_output = ao_mix.outputs["Color"]
+        links.new(color_output, principled.inputs["Base Color"])
+    if "Metalness" in files:
+        metalness_tex = nodes.new(type="ShaderNodeTexImage")
+        metalness_tex.name = TEXTURE_NODE_PREFIX + "Metalness"
+        metalness_tex.location = (-900, 150)
+        metalness_tex.image = load_image(extract_path / files["Metalness"])
+        metalness_tex.image.colorspace_settings.name = "Non-Color"
+        links.new(metalness_tex.outputs["Color"], principled.inputs["Metallic"])
+    if "Roughness" in files:
+        roughness_tex = nodes.new(type="ShaderNodeTexImage")
+        roughness_tex.name = TEXTURE_NODE_PREFIX + "Roughness"
+        roughness_tex.location = (-600, 0)
+        roughness_tex.image = load_image(extract_path / files["Roughness"])
+        roughness_tex.image.colorspace_settings.name = "Non-Color"
+        links.new(roughness_tex.outputs["Color"], principled.inputs["Roughness"])
+    if "NormalGL" in files:
+        normal_tex = nodes.new(type="ShaderNodeTexImage")
+        normal_tex.name = TEXTURE_NODE_PREFIX + "NormalGL"
+        normal_tex.location = (-600, -300)
+        normal_tex.image = load_image(extract_path / files["NormalGL"])
+        normal_tex.image.colorspace_settings.name = "Non-Color"
+        normal_map = nodes.new(type="ShaderNodeNormalMap")
+        normal_map.location = (-300, -300)
+        links.new(normal_tex.outputs["Color"], normal_map.inputs["Color"])
+        links.new(normal_map.outputs["Normal"], principled.inputs["Normal"])
+    if "Displacement" in files:
+        displacement_tex = nodes.new(type="ShaderNodeTexImage")
+        displacement_tex.name = TEXTURE_NODE_PREFIX + "Displacement"
+        displacement_tex.location = (-600, -600)
+        displacement_tex.image = load_image(extract_path / files["Displacement"])
+        displacement_tex.image.colorspace_settings.name = "Non-Color"
+        displacement = nodes.new(type="ShaderNodeDisplacement")
+        displacement.location = (-300, -600)
+        links.new(displacement_tex.outputs["Color"], displacement.inputs["Height"])
+        links.new(displacement.outputs["Displacement"], material_output.inputs["Displacement"])
     return material
 
+# Maps import keys to material names; materials also carry the key, so files saved
+# and reopened later are still found by the scan in find_imported_material
+import_registry = {}
+
+def get_import_key(asset_id, resolution, maps, fmt="PNG"):
+    return f"{asset_id}|{resolution}-{fmt}|{','.join(sorted(maps))}"
+
+def find_imported_material(key):
+    name = import_registry.get(key)
+    mat = bpy.data.materials.get(name) if name else None
+    if mat is not None and mat.get("ambientcg_key") == key:
+        return mat
+    for mat in bpy.data.materials:
+        if mat.get("ambientcg_key") == key:
+            import_registry[key] = mat.name
+            return mat
+    import_registry.pop(key, None)
+    return None
+
+def import_material(asset_id, resolution, extract_path, maps=None, force_rebuild=False, fmt="PNG"):
+    # Returns the material already built for this asset/resolution/map set when there is one
+    wanted_maps = get_wanted_maps() if maps is None else maps
+    key = get_import_key(asset_id, resolution, wanted_maps, fmt)
+    if not force_rebuild:
+        mat = find_imported_material(key)
+        if mat is not None:
+            return mat
+    texture_path, converted_path = get_texture_source(extract_path)
+    with metrics.measure("material.build"):
+        mat = create_material_from_extracted(texture_path, asset_id, wanted_maps)
+    mat["ambientcg_key"] = key
+    import_registry[key] = mat.name
+    if converted_path is not None:
+        start_conversion(extract_path, converted_path, mat.name, asset_id, resolution, fmt)
+    return mat
+
+def swap_material_textures(mat, asset_id, resolution, extract_path, maps=None, fmt="PNG"):
+    # Points the texture nodes of an existing material at another resolution of the same maps
+    files = find_map_files(extract_path, prefer_exr_displacement())
+    for node in mat.node_tree.nodes:
+        if node.type != 'TEX_IMAGE' or not node.name.startswith(TEXTURE_NODE_PREFIX):
+            continue
+        map_name = node.name[len(TEXTURE_NODE_PREFIX):]
+        if map_name not in files:
+            continue
+        colorspace = node.image.colorspace_settings.name if node.image else "Non-Color"
+        node.image = load_image(extract_path / files[map_name])
+        node.image.colorspace_settings.name = colorspace
+    wanted_maps = get_wanted_maps() if maps is None else maps
+    old_key = mat.get("ambientcg_key")
+    if old_key and import_registry.get(old_key) == mat.name:
+        del import_registry[old_key]
+    key = get_import_key(asset_id, resolution, wanted_maps, fmt)
+    mat["ambientcg_key"] = key
+    import_registry[key] = mat.name
+
 def download_preview_async(url):
-    image_name = os.path.basename(url)
-    image_path = os.path.join(get_cache_dir(), image_name)
     try:
-        img_data = requests.get(url).content
-        with open(image_path, 'wb') as handler:
-            handler.write(img_data)
+        started = time.perf_counter()
+        response = get_http_session().get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        get_thumbnail_store().put(url, "encoded", response.content)
+        metrics.record("preview.download", time.perf_counter() - started, len(response.content))
     except Exception as e:
         print(f"Failed to download preview image from URL {url}: {e}")
+    finally:
+        with preview_download_lock:
+            preview_download_futures.pop(url, None)
+        thumbnail_scheduler.notify_ready(url)
+
+def cancel_preview_downloads(keep_urls=()):
+    # Drop queued downloads that the new result set no longer shows; running ones finish
+    keep_urls = set(keep_urls)
     with preview_download_lock:
-        if url in preview_download_threads:
-            del preview_download_threads[url]
+        for url, future in list(preview_download_futures.items()):
+            if url not in keep_urls and future.cancel():
+                del preview_download_futures[url]
+                thumbnail_scheduler.waiting.discard(url)
 
-def get_preview_icon(url):
+def load_cached_preview(url):
+    # Loads an already downloaded preview into the collection; True on success
     pcoll = preview_collections["ambientcg"]
     if url in pcoll:
+        touch_preview(url)
+        return True
+    stored = get_thumbnail_store().get(url)
+    if stored is None:
+        return False
+    kind, width, height, data = stored
+    try:
+        with metrics.measure("preview.load"):
+            if kind == "pixels":
+                load_pixel_preview(pcoll, url, width, height, data)
+            else:
+                load_encoded_preview(pcoll, url, data)
+        touch_preview(url)
+        return True
+    except Exception as e:
+        print(f"Failed to load preview image from URL {url}: {e}")
+        return False
+
+def request_preview_download(url):
+    # Returns False when the download couldn't be queued
+    executor = get_preview_executor()
+    with preview_download_lock:
+        if url not in preview_download_futures:
+            try:
+                preview_download_futures[url] = executor.submit(download_preview_async, url)
+            except RuntimeError:
+                return False
+    return True
+
+def get_preview_icon(url):
+    pcoll = preview_collections["ambientcg"]
+    if load_cached_preview(url):
         return pcoll[url].icon_id
-    else:
-        image_name = os.path.basename(url)
-        image_path = os.path.join(get_cache_dir(), image_name)
-        if not os.path.exists(image_path):
-            with preview_download_lock:
-                if url not in preview_download_threads:
-                    t = threading.Thread(target=download_preview_async, args=(url,))
-                    t.daemon = True
-                    t.start()
-                    preview_download_threads[url] = t
+    metrics.cache_lookup("previews", False)
+    request_preview_download(url)
+    return 0
+
+# -------------------------------------------------------------------
+# Preview retention (bounded LRU that survives searches)
+# -------------------------------------------------------------------
+DEFAULT_MAX_PREVIEW_ICONS = 1000
+# Thumbnail URLs in the preview collection, least recently used first
+preview_lru = OrderedDict()
+
+def touch_preview(url):
+    preview_lru[url] = None
+    preview_lru.move_to_end(url)
+
+def get_max_preview_icons():
+    prefs = get_addon_prefs()
+    return prefs.max_preview_icons if prefs else DEFAULT_MAX_PREVIEW_ICONS
+
+def trim_previews():
+    # Drops the least recently used icons beyond the limit, never ones on the current page
+    pcoll = preview_collections.get("ambientcg")
+    if pcoll is None:
+        return
+    excess = len(pcoll) - get_max_preview_icons()
+    if excess <= 0:
+        return
+    visible = {item[1] for item in get_visible_items()}
+    for url in list(preview_lru):
+        if excess <= 0:
+            break
+        if url in visible:
+            continue
+        del preview_lru[url]
+        if url in pcoll:
+            # ImagePreviewCollection.__delitem__ releases the preview
+            del pcoll[url]
+            excess -= 1
+
+def max_preview_icons_changed(self, context):
+    trim_previews()
+
+# -------------------------------------------------------------------
+# Packed thumbnail store (one mapped pack file instead of loose images)
+# -------------------------------------------------------------------
+THUMBNAIL_INDEX_NAME = "thumbnails.json"
+THUMBNAIL_PACK_PATTERN = re.compile(r"thumbnails-(\d+)\.pack$")
+# A pack is rewritten once less than this share of it is still referenced
+THUMBNAIL_LIVE_RATIO = 0.5
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+thumbnail_store = None
+thumbnail_store_lock = threading.Lock()
+thumbnail_scratch_dir = None
+
+def thumbnail_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+def thumbnail_alias(name):
+    # Previews cached as loose files before the store only know their URL's file name
+    return "file:" + name
+
+class ThumbnailStore:
+    # Thumbnails live in an append-only pack next to a JSON index of
+    # {key: [offset, length, kind, width, height, atime]}. kind is "encoded" (the PNG/JPG
+    # as downloaded) or "pixels" (zlib compressed 32-bit RGBA, ready for ImagePreview).
+    # Compaction writes a new pack generation, so readers never see offsets move.
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.index_path = self.cache_dir / THUMBNAIL_INDEX_NAME
+        self.lock = threading.RLock()
+        self.entries = {}
+        self.removed = set()
+        self.pack_name = None
+        self.index_mtime = None
+        self.map = None
+        self.mapped_name = None
+        self.dirty = False
+        self.reload()
+
+    def index_changed(self):
+        try:
+            return self.index_path.stat().st_mtime_ns != self.index_mtime
+        except OSError:
+            return self.index_mtime is not None
+
+    def reload(self):
+        # Picks up entries other processes sharing the cache have saved
+        with self.lock:
+            data = read_json(self.index_path)
+            try:
+                self.index_mtime = self.index_path.stat().st_mtime_ns
+            except OSError:
+                self.index_mtime = None
+            if not isinstance(data, dict) or not isinstance(data.get("entries"), dict) \
+                    or not THUMBNAIL_PACK_PATTERN.match(str(data.get("pack"))):
+                data = {"pack": self.pack_name or "thumbnails-1.pack", "entries": {}}
+            if data["pack"] != self.pack_name:
+                # Compacted elsewhere: unsaved offsets here point into the old pack
+                self.entries = {}
+                self.removed.clear()
+                self.pack_name = data["pack"]
+            for key, entry in data["entries"].items():
+                if key not in self.removed:
+                    self.entries.setdefault(key, entry)
+
+    def close_map(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+            self.mapped_name = None
+
+    def read(self, offset, length):
+        if self.map is None or self.mapped_name != self.pack_name or len(self.map) < offset + length:
+            self.close_map()
+            with open(self.cache_dir / self.pack_name, "rb") as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.mapped_name = self.pack_name
+        if len(self.map) < offset + length:
+            raise IOError("Thumbnail pack is shorter than its index")
+        return self.map[offset:offset + length]
+
+    def get(self, url):
+        # Returns (kind, width, height, data) or None
+        key = thumbnail_key(url)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                alias = thumbnail_alias(os.path.basename(url))
+                entry = self.entries.pop(alias, None)
+                if entry is not None:
+                    self.removed.add(alias)
+                    self.entries[key] = entry
+            if entry is None and self.index_changed():
+                self.reload()
+                entry = self.entries.get(key)
+            if entry is None:
+                return None
+            try:
+                data = self.read(entry[0], entry[1])
+            except (OSError, ValueError) as e:
+                print(f"Failed to read thumbnail for {url}: {e}")
+                self.entries.pop(key, None)
+                return None
+            entry[5] = time.time()
+            self.dirty = True
+        return entry[2], entry[3], entry[4], data
+
+    def put(self, url, kind, data, width=0, height=0):
+        self.add(thumbnail_key(url), kind, data, width, height)
+
+    def add(self, key, kind, data, width=0, height=0):
+        try:
+            with CacheLock(THUMBNAIL_INDEX_NAME, timeout=30):
+                with self.lock:
+                    if self.index_changed():
+                        self.reload()
+                    with open(self.cache_dir / self.pack_name, "ab") as f:
+                        offset = f.seek(0, os.SEEK_END)
+                        f.write(data)
+                    self.entries[key] = [offset, len(data), kind, width, height, time.time()]
+                    self.removed.discard(key)
+                    self.dirty = True
+        except (OSError, TimeoutError) as e:
+            print(f"Failed to store thumbnail: {e}")
+
+    def contains(self, url):
+        with self.lock:
+            return thumbnail_key(url) in self.entries
+
+    def live_size(self):
+        with self.lock:
+            return sum(length for _, length in {(entry[0], entry[1]) for entry in self.entries.values()})
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+        try:
+            with CacheLock(THUMBNAIL_INDEX_NAME, timeout=30):
+                with self.lock:
+                    self.reload()
+                    write_json_atomic(self.index_path, {"pack": self.pack_name, "entries": self.entries})
+                    self.index_mtime = self.index_path.stat().st_mtime_ns
+                    self.removed.clear()
+                    self.dirty = False
+        except (OSError, TimeoutError) as e:
+            print(f"Failed to write thumbnail index: {e}")
+
+    def evict(self, budget):
+        # Keeps the most recently used thumbnails within budget, rewriting the pack when it
+        # is over budget or mostly holds blobs that were replaced or dropped
+        self.save()
+        with self.lock:
+            self.reload()
+            pack_size = self.size()
+            if pack_size <= budget and self.live_size() >= pack_size * THUMBNAIL_LIVE_RATIO:
+                return
+            keep = []
+            used = 0
+            for key, entry in sorted(self.entries.items(), key=lambda item: item[1][5], reverse=True):
+                if used + entry[1] > budget:
+                    break
+                keep.append((key, list(entry)))
+                used += entry[1]
+            pack_name = self.pack_name
+            seen = {(key, entry[0]) for key, entry in self.entries.items()}
+        self.compact(pack_name, keep, seen)
+
+    def clear(self):
+        with self.lock:
+            self.reload()
+            pack_name = self.pack_name
+        self.compact(pack_name, [], None)
+
+    @staticmethod
+    def copy_blob(src, dst, entry):
+        # Returns the entry for the blob's new place in dst, or None if src is short
+        src.seek(entry[0])
+        data = src.read(entry[1])
+        if len(data) != entry[1]:
+            return None
+        offset = dst.tell()
+        dst.write(data)
+        return [offset] + entry[1:]
+
+    def compact(self, pack_name, keep, seen):
+        # Copies the kept blobs into the next pack generation without holding any lock, so
+        # lookups and other processes carry on meanwhile. Packs are append-only, so the snapshot
+        # offsets stay valid; blobs added since `seen` was taken are copied over at the swap.
+        # seen=None drops those too (clearing the store).
+        generation = int(THUMBNAIL_PACK_PATTERN.match(pack_name).group(1)) + 1
+        new_name = f"thumbnails-{generation}.pack"
+        tmp_path = temp_path_for(self.cache_dir / new_name)
+        copied = {}
+        try:
+            with open(self.cache_dir / pack_name, "rb") as src, open(tmp_path, "wb") as dst:
+                for key, entry in keep:
+                    new_entry = self.copy_blob(src, dst, entry)
+                    if new_entry is not None:
+                        copied[key] = (entry[0], new_entry)
+                with CacheLock(THUMBNAIL_INDEX_NAME, timeout=30):
+                    with self.lock:
+                        self.reload()
+                        if self.pack_name != pack_name:
+                            # Another process compacted first
+                            return
+                        new_entries = {}
+                        for key, entry in self.entries.items():
+                            if key in copied and copied[key][0] == entry[0]:
+                                new_entries[key] = copied[key][1][:5] + [entry[5]]
+                            elif seen is not None and (key, entry[0]) not in seen:
+                                new_entry = self.copy_blob(src, dst, entry)
+                                if new_entry is not None:
+                                    new_entries[key] = new_entry
+                        dst.close()
+                        os.replace(tmp_path, self.cache_dir / new_name)
+                        write_json_atomic(self.index_path, {"pack": new_name, "entries": new_entries})
+                        self.close_map()
+                        self.pack_name = new_name
+                        self.entries = new_entries
+                        self.removed.clear()
+                        self.dirty = False
+                        self.index_mtime = self.index_path.stat().st_mtime_ns
+        except (OSError, TimeoutError) as e:
+            print(f"Failed to compact thumbnail store: {e}")
+            return
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        for name in os.listdir(self.cache_dir):
+            if THUMBNAIL_PACK_PATTERN.match(name) and name != new_name:
+                try:
+                    os.remove(self.cache_dir / name)
+                except OSError:
+                    # Still mapped by another process on Windows; the next compaction retries
+                    pass
+
+    def migrate(self, names):
+        # Moves loose preview files from older versions into the pack
+        for name in names:
+            path = self.cache_dir / name
+            try:
+                data = path.read_bytes()
+            except OSError:
+                continue
+            self.add(thumbnail_alias(name), "encoded", data)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        self.save()
+
+    def size(self):
+        try:
+            return (self.cache_dir / self.pack_name).stat().st_size
+        except OSError:
             return 0
+
+def get_thumbnail_store():
+    global thumbnail_store
+    with thumbnail_store_lock:
+        if thumbnail_store is None:
+            thumbnail_store = ThumbnailStore(get_cache_dir())
+        return thumbnail_store
+
+def get_thumbnail_scratch_dir():
+    # Local temp folder for the one-off file Blender needs to decode a preview
+    global thumbnail_scratch_dir
+    if thumbnail_scratch_dir is None:
+        thumbnail_scratch_dir = Path(tempfile.mkdtemp(prefix="ambientcg-thumbs-"))
+    return thumbnail_scratch_dir
+
+def image_extension(data):
+    if data.startswith(PNG_SIGNATURE):
+        return ".png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if data[8:12] == b"WEBP":
+        return ".webp"
+    return ".png"
+
+def store_decoded_thumbnails():
+    prefs = get_addon_prefs()
+    return prefs.store_decoded_thumbnails if prefs else True
+
+def store_preview_pixels(url, width, height, pixels):
+    get_thumbnail_store().put(url, "pixels", zlib.compress(pixels, 1), width, height)
+
+def load_encoded_preview(pcoll, url, data):
+    # Blender decodes previews from files only: round trip through a scratch file once,
+    # then keep the decoded pixels so later sessions skip the file entirely
+    scratch_path = get_thumbnail_scratch_dir() / (thumbnail_key(url) + image_extension(data))
+    scratch_path.write_bytes(data)
+    try:
+        preview = pcoll.load(url, str(scratch_path), 'IMAGE')
+        # Reading the size forces the decode while the scratch file still exists
+        width, height = preview.image_size
+        if width and height and store_decoded_thumbnails():
+            pixels = array.array("i", bytes(4 * width * height))
+            preview.image_pixels.foreach_get(pixels)
+            try:
+                get_preview_executor().submit(store_preview_pixels, url, width, height, pixels.tobytes())
+            except RuntimeError:
+                pass
+    finally:
+        try:
+            scratch_path.unlink()
+        except OSError:
+            pass
+
+def load_pixel_preview(pcoll, url, width, height, data):
+    preview = pcoll.new(url)
+    preview.image_size = (width, height)
+    pixels = array.array("i")
+    pixels.frombytes(zlib.decompress(data))
+    preview.image_pixels.foreach_set(pixels)
+
+# -------------------------------------------------------------------
+# Cache management (size budgets with LRU eviction)
+# -------------------------------------------------------------------
+CACHE_MANIFEST_NAME = "cache_manifest.json"
+PREVIEW_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+# Files the addon keeps in the cache root that are never evicted
+CACHE_METADATA_FILES = {CATALOG_SNAPSHOT_NAME, CATALOG_INDEX_NAME, CACHE_MANIFEST_NAME, THUMBNAIL_INDEX_NAME}
+DEFAULT_PREVIEW_BUDGET_MB = 512
+DEFAULT_TEXTURE_BUDGET_MB = 20480
+# Time per timer tick the thumbnail scheduler may spend loading previews
+DEFAULT_THUMBNAIL_BUDGET_MS = 8
+
+def get_addon_prefs():
+    addon = bpy.context.preferences.addons.get(__name__)
+    return addon.preferences if addon else None
+
+def classify_cache_entry(name, is_dir):
+    if name in CACHE_METADATA_FILES or name.endswith((".part", ".tmp", ".lock", ".pack", VERIFY_SUFFIX, ".prof")):
+        return None
+    if is_dir or name.endswith(".zip"):
+        return "textures"
+    if name.lower().endswith(PREVIEW_EXTENSIONS):
+        return "previews"
+    return None
+
+def entry_size(path):
+    if not path.is_dir():
+        return path.stat().st_size
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for file in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return total
+
+class CacheManager:
+    # Tracks top-level entries of the cache dir by name: {"category", "size", "atime"}
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / CACHE_MANIFEST_NAME
+        self.lock = threading.RLock()
+        self.entries = self.read_manifest()
+        # Names removed since the last save, so merging doesn't bring them back
+        self.removed = set()
+        self.dirty = False
+
+    def read_manifest(self):
+        data = read_json(self.manifest_path)
+        entries = data.get("entries") if isinstance(data, dict) else None
+        return entries if isinstance(entries, dict) else {}
+
+    def record(self, name, category=None):
+        path = self.cache_dir / name
+        if category is None:
+            category = classify_cache_entry(name, path.is_dir())
+        if category is None:
+            return
+        try:
+            size = entry_size(path)
+        except OSError:
+            return
+        with self.lock:
+            self.entries[name] = {"category": category, "size": size, "atime": time.time()}
+            self.removed.discard(name)
+            self.dirty = True
+
+    def touch(self, name):
+        with self.lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                self.record(name)
+            else:
+                entry["atime"] = time.time()
+                self.dirty = True
+
+    def forget(self, name):
+        with self.lock:
+            if self.entries.pop(name, None) is not None:
+                self.removed.add(name)
+                self.dirty = True
+
+    def scan(self):
+        # Picks up entries created before the manifest existed and drops vanished ones
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        with self.lock:
+            known = set(self.entries)
+        for name in names:
+            if name not in known:
+                self.record(name)
+        with self.lock:
+            for name in known.difference(names):
+                self.forget(name)
+        self.remove_stale_locks(names)
+        self.save()
+
+    def usage(self):
+        totals = {"previews": 0, "textures": 0}
+        with self.lock:
+            for entry in self.entries.values():
+                totals[entry["category"]] = totals.get(entry["category"], 0) + entry["size"]
+        return totals
+
+    def remove(self, name):
+        path = self.cache_dir / name
+        lock = None
+        with self.lock:
+            category = self.entries.get(name, {}).get("category")
+        key = name[:-len(".zip")] if name.endswith(".zip") else name
+        if category == "textures":
+            # Skip entries another process is downloading or extracting right now
+            try:
+                lock = CacheLock(key, timeout=0).acquire()
+            except TimeoutError:
+                return False
+        removed = False
+        try:
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+                verify_path = path.with_name(name + VERIFY_SUFFIX)
+                if verify_path.exists():
+                    verify_path.unlink()
+            removed = True
+        except OSError as e:
+            print(f"Failed to evict cache entry {name}: {e}")
+            return False
+        finally:
+            if lock is not None:
+                # The lock file goes with the last of the archive and its extracted folder
+                other = self.cache_dir / (key if name.endswith(".zip") else f"{key}.zip")
+                lock.release(remove=removed and not other.exists())
+        self.forget(name)
+        return True
+
+    def remove_stale_locks(self, names):
+        # Lock files of texture entries that no longer exist, e.g. left by cancelled downloads
+        present = set(names)
+        for name in names:
+            if not name.endswith(".lock"):
+                continue
+            key = name[:-len(".lock")]
+            if key in CACHE_METADATA_FILES or key in present or f"{key}.zip" in present or f"{key}.zip.part" in present:
+                continue
+            try:
+                CacheLock(key, timeout=0).acquire().release(remove=True)
+            except TimeoutError:
+                pass
+
+    def evict(self, budgets, protected=()):
+        # budgets: {category: max bytes}; protected: names the open .blend still references
+        protected = set(protected)
+        for category, budget in budgets.items():
+            with self.lock:
+                candidates = sorted(
+                    (entry["atime"], name, entry["size"])
+                    for name, entry in self.entries.items()
+                    if entry["category"] == category
+                )
+            used = sum(size for _, _, size in candidates)
+            for _, name, size in candidates:
+                if used <= budget:
+                    break
+                if name in protected:
+                    continue
+                if self.remove(name):
+                    used -= size
+        self.save()
+
+    def save(self):
+        # Merges with what other processes sharing the cache have written meanwhile
+        with self.lock:
+            if not self.dirty:
+                return
+        try:
+            with CacheLock(CACHE_MANIFEST_NAME, timeout=30):
+                with self.lock:
+                    for name, entry in self.read_manifest().items():
+                        if name in self.removed or not isinstance(entry, dict) or "category" not in entry:
+                            continue
+                        current = self.entries.get(name)
+                        if current is None or current["atime"] < entry.get("atime", 0):
+                            self.entries[name] = entry
+                    data = {"entries": dict(self.entries)}
+                    self.removed.clear()
+                    self.dirty = False
+                write_json_atomic(self.manifest_path, data)
+        except (OSError, TimeoutError) as e:
+            print(f"Failed to write cache manifest: {e}")
+
+cache_manager = None
+cache_manager_lock = threading.Lock()
+cache_eviction_thread = None
+
+def get_cache_manager():
+    # Download workers, the prefetcher and the eviction worker can all get here first
+    global cache_manager
+    with cache_manager_lock:
+        if cache_manager is None:
+            cache_manager = CacheManager(get_cache_dir())
+        return cache_manager
+
+def referenced_cache_entries():
+    # Must run on the main thread: reads bpy.data
+    cache_dir = get_cache_dir().resolve()
+    protected = set()
+    for image in bpy.data.images:
+        if not image.filepath:
+            continue
+        try:
+            relative = Path(bpy.path.abspath(image.filepath)).resolve().relative_to(cache_dir)
+        except ValueError:
+            continue
+        if relative.parts:
+            protected.add(relative.parts[0])
+    return protected
+
+def get_cache_budgets():
+    prefs = get_addon_prefs()
+    preview_mb = prefs.preview_budget_mb if prefs else DEFAULT_PREVIEW_BUDGET_MB
+    texture_mb = prefs.texture_budget_mb if prefs else DEFAULT_TEXTURE_BUDGET_MB
+    return {"previews": preview_mb * 1024 * 1024, "textures": texture_mb * 1024 * 1024}
+
+def schedule_cache_eviction(scan=False, purge=()):
+    # Gathers protected entries on the main thread, then evicts on a worker. Categories in
+    # `purge` are emptied instead of trimmed to their budget. Returns False if one is running
+    global cache_eviction_thread
+    if cache_eviction_thread is not None and cache_eviction_thread.is_alive():
+        return False
+    manager = get_cache_manager()
+    budgets = get_cache_budgets()
+    budgets.update({category: 0 for category in purge})
+    protected = referenced_cache_entries()
+
+    store = get_thumbnail_store()
+
+    def run():
+        if scan:
+            store.migrate([name for name in os.listdir(manager.cache_dir)
+                           if classify_cache_entry(name, False) == "previews"])
+            manager.scan()
+        before = sum(get_cache_usage().values())
+        manager.evict(budgets, protected)
+        if "previews" in purge:
+            store.clear()
+        else:
+            store.evict(budgets["previews"])
+        if purge:
+            print(f"Freed {format_bytes(before - sum(get_cache_usage().values()))} from the AmbientCG cache")
+
+    cache_eviction_thread = threading.Thread(target=run, daemon=True)
+    cache_eviction_thread.start()
+    return True
+
+def startup_cache_maintenance():
+    # Timer callback: bpy.data is not available while the addon registers
+    schedule_cache_eviction(scan=True)
+    return None
+
+def get_cache_usage():
+    usage = get_cache_manager().usage()
+    usage["previews"] += get_thumbnail_store().size()
+    return usage
+
+def format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+
+class AMBIENTCG_OT_PurgeCache(bpy.types.Operator):
+    bl_idname = "ambientcg.purge_cache"
+    bl_label = "Purge AmbientCG Cache"
+    bl_description = "Delete cached files that the open file does not use"
+
+    category: bpy.props.EnumProperty(
+        items=[
+            ("ALL", "All", "Previews and textures"),
+            ("PREVIEWS", "Previews", "Thumbnail images"),
+            ("TEXTURES", "Textures", "Downloaded archives and extracted maps"),
+        ],
+        default="ALL",
+    )
+
+    def execute(self, context):
+        categories = {"ALL": ["previews", "textures"], "PREVIEWS": ["previews"], "TEXTURES": ["textures"]}[self.category]
+        # Deleting thousands of files can take a while, so it runs on the eviction worker
+        if not schedule_cache_eviction(purge=categories):
+            self.report({"WARNING"}, "Cache cleanup is already running, try again in a moment")
+            return {"CANCELLED"}
+        if "textures" in categories:
+            downloaded_assets.clear()
+        self.report({"INFO"}, "Purging the AmbientCG cache in the background")
+        return {"FINISHED"}
+
+def apply_shared_cache_root(prefs):
+    # Points the cache at the preference's folder; state tied to the old folder is dropped
+    global shared_cache_root, cache_manager, search_cache, thumbnail_store
+    root = bpy.path.abspath(prefs.shared_cache_dir) if prefs and prefs.shared_cache_dir else ""
+    if root == shared_cache_root:
+        return
+    if cache_manager is not None:
+        cache_manager.save()
+    if thumbnail_store is not None:
+        thumbnail_store.save()
+        thumbnail_store.close_map()
+    shared_cache_root = root
+    with cache_manager_lock:
+        cache_manager = None
+    search_cache = None
+    with thumbnail_store_lock:
+        thumbnail_store = None
+
+def shared_cache_dir_changed(self, context):
+    apply_shared_cache_root(self)
+
+class AMBIENTCG_AddonPreferences(bpy.types.AddonPreferences):
+    bl_idname = __name__
+
+    shared_cache_dir: bpy.props.StringProperty(
+        name="Shared Cache Folder",
+        description="Cache folder shared with other machines and render nodes, e.g. on a network drive. "
+                    "Leave empty for the per-user cache; AMBIENTCG_CACHE_DIR overrides both",
+        subtype='DIR_PATH',
+        default="",
+        update=shared_cache_dir_changed,
+    )
+    preview_budget_mb: bpy.props.IntProperty(
+        name="Preview Budget (MB)",
+        description="Maximum disk space for cached thumbnails",
+        default=DEFAULT_PREVIEW_BUDGET_MB,
+        min=16,
+    )
+    texture_budget_mb: bpy.props.IntProperty(
+        name="Texture Budget (MB)",
+        description="Maximum disk space for downloaded and extracted textures",
+        default=DEFAULT_TEXTURE_BUDGET_MB,
+        min=256,
+    )
+    bandwidth_limit_kbps: bpy.props.IntProperty(
+        name="Bandwidth Limit (KB/s)",
+        description="Combined speed cap for texture downloads, 0 for unlimited",
+        default=0,
+        min=0,
+    )
+    max_preview_icons: bpy.props.IntProperty(
+        name="Max Preview Icons",
+        description="Thumbnails kept in memory across searches (about 256 KB each); "
+                    "the least recently shown are dropped first",
+        default=DEFAULT_MAX_PREVIEW_ICONS,
+        min=50,
+        update=max_preview_icons_changed,
+    )
+    store_decoded_thumbnails: bpy.props.BoolProperty(
+        name="Store Decoded Thumbnails",
+        description="Keep thumbnails as decoded pixels so they load without decoding or file access; "
+                    "uses more disk space",
+        default=True,
+    )
+    thumbnail_budget_ms: bpy.props.IntProperty(
+        name="Thumbnail Budget (ms)",
+        description="Time per UI tick spent loading thumbnails; lower keeps the interface snappier",
+        default=DEFAULT_THUMBNAIL_BUDGET_MS,
+        min=1,
+        max=100,
+    )
+    prefetch_enabled: bpy.props.BoolProperty(
+        name="Prefetch Visible Results",
+        description="While the panel is idle, download the first results of the current page "
+                    "at the selected resolution so importing them is instant",
+        default=False,
+    )
+    prefetch_count: bpy.props.IntProperty(
+        name="Results to Prefetch",
+        description="How many of the visible results to prefetch",
+        default=4,
+        min=1,
+        max=20,
+    )
+    prefetch_bandwidth_kbps: bpy.props.IntProperty(
+        name="Prefetch Bandwidth (KB/s)",
+        description="Speed cap for prefetching",
+        default=1024,
+        min=16,
+    )
+    prefetch_budget_mb: bpy.props.IntProperty(
+        name="Prefetch Budget (MB)",
+        description="Stop prefetching once this much prefetched data hasn't been imported",
+        default=1024,
+        min=16,
+    )
+    texture_format: bpy.props.EnumProperty(
+        name="Texture Format",
+        description="Archive variant to download; JPG is several times smaller than PNG",
+        items=[
+            ("PNG", "PNG", "Lossless maps, largest downloads"),
+            ("JPG", "JPG", "Compressed maps, smallest downloads"),
+        ],
+        default="PNG",
+        update=texture_format_changed,
+    )
+    prefer_exr_displacement: bpy.props.BoolProperty(
+        name="Prefer EXR Displacement",
+        description="Use the EXR displacement map when the archive includes one",
+        default=False,
+    )
+    convert_max_size: bpy.props.EnumProperty(
+        name="Downscale Maps To",
+        description="Downscale imported maps in a background process and cache the results next to the originals",
+        items=[
+            ("OFF", "Off", "Use the maps as downloaded"),
+            ("1024", "1024 px", "Downscale maps larger than 1024 px"),
+            ("2048", "2048 px", "Downscale maps larger than 2048 px"),
+            ("4096", "4096 px", "Downscale maps larger than 4096 px"),
+        ],
+        default="OFF",
+    )
+    import_metalness: bpy.props.BoolProperty(
+        name="Import Metalness",
+        description="Extract and connect the Metalness map when the asset has one",
+        default=True,
+    )
+    import_ambient_occlusion: bpy.props.BoolProperty(
+        name="Import Ambient Occlusion",
+        description="Extract the AO map and multiply it over the base color",
+        default=False,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        usage = get_cache_usage()
+        box = layout.box()
+        box.label(text=f"Cache: {get_cache_dir()}", icon='FILE_FOLDER')
+        box.prop(self, "shared_cache_dir")
+        row = box.row()
+        row.prop(self, "preview_budget_mb")
+        row.label(text=f"Used: {format_bytes(usage['previews'])}")
+        row.operator("ambientcg.purge_cache", text="Purge", icon='TRASH').category = "PREVIEWS"
+        row = box.row()
+        row.prop(self, "texture_budget_mb")
+        row.label(text=f"Used: {format_bytes(usage['textures'])}")
+        row.operator("ambientcg.purge_cache", text="Purge", icon='TRASH').category = "TEXTURES"
+        box.operator("ambientcg.purge_cache", text="Purge Everything", icon='TRASH').category = "ALL"
+        layout.prop(self, "bandwidth_limit_kbps")
+        box = layout.box()
+        box.prop(self, "prefetch_enabled")
+        col = box.column()
+        col.active = self.prefetch_enabled
+        row = col.row()
+        row.prop(self, "prefetch_count")
+        row.prop(self, "prefetch_bandwidth_kbps")
+        col.prop(self, "prefetch_budget_mb")
+        row = layout.row()
+        row.prop(self, "thumbnail_budget_ms")
+        row.prop(self, "max_preview_icons")
+        layout.prop(self, "store_decoded_thumbnails")
+        row = layout.row()
+        row.prop(self, "texture_format")
+        row.prop(self, "convert_max_size")
+        layout.prop(self, "prefer_exr_displacement")
+        row = layout.row()
+        row.prop(self, "import_metalness")
+        row.prop(self, "import_ambient_occlusion")
+
+# -------------------------------------------------------------------
+# Download manager (parallel, resumable, atomic)
+# -------------------------------------------------------------------
+MAX_CONCURRENT_DOWNLOADS = 3
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# Chunk size adapts so that one read takes roughly this long
+TARGET_CHUNK_SECONDS = 0.25
+
+class DownloadCancelled(Exception):
+    pass
+
+class BandwidthLimiter:
+    # Shared across all downloads; a limit of 0 means unlimited
+    def __init__(self, bytes_per_second=0):
+        self.bytes_per_second = bytes_per_second
+        self.lock = threading.Lock()
+        self.next_free = 0.0
+
+    def consume(self, nbytes):
+        if not self.bytes_per_second:
+            return
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_free)
+            self.next_free = start + nbytes / self.bytes_per_second
+            delay = self.next_free - now
+        if delay > 0:
+            time.sleep(delay)
+
+def download_file(url, dest_path, job=None, limiter=None):
+    # Streams into dest_path + ".part", resuming it with a Range request when present,
+    # and only renames to dest_path once the transfer is complete
+    dest_path = Path(dest_path)
+    part_path = dest_path.with_name(dest_path.name + ".part")
+    resume_from = part_path.stat().st_size if part_path.exists() else 0
+    headers = {"Range": f"bytes={resume_from}-"} if resume_from else {}
+    started = time.perf_counter()
+    with get_http_session().get(url, stream=True, headers=headers, timeout=REQUEST_TIMEOUT) as r:
+        if r.status_code == 416:
+            # Nothing past resume_from: the .part may already hold the whole archive
+            match = re.match(r"bytes \*/(\d+)$", r.headers.get("content-range", ""))
+            if match and int(match.group(1)) == resume_from:
+                digest = file_sha256(part_path).hexdigest()
+                os.replace(part_path, dest_path)
+                write_archive_record(dest_path, digest)
+                if job is not None:
+                    job.total_size = job.downloaded = resume_from
+                return dest_path
+            # The partial file doesn't match what the server has now: start over
+            part_path.unlink()
+            return download_file(url, dest_path, job, limiter)
+        r.raise_for_status()
+        if resume_from and r.status_code != 206:
+            resume_from = 0
+        total_size = int(r.headers.get("content-length", 0))
+        if total_size:
+            total_size += resume_from
+        if job is not None:
+            job.total_size = total_size
+            job.downloaded = resume_from
+        downloaded = resume_from
+        chunk_size = MIN_CHUNK_SIZE
+        hasher = file_sha256(part_path) if resume_from else hashlib.sha256()
+        with open(part_path, "ab" if resume_from else "wb") as f:
+            while True:
+                if job is not None and job.cancel_event.is_set():
+                    raise DownloadCancelled()
+                chunk_started = time.monotonic()
+                chunk = r.raw.read(chunk_size, decode_content=True)
+                if not chunk:
+                    break
+                f.write(chunk)
+                hasher.update(chunk)
+                downloaded += len(chunk)
+                if job is not None:
+                    job.downloaded = downloaded
+                if limiter is not None:
+                    limiter.consume(len(chunk))
+                elapsed = time.monotonic() - chunk_started
+                if elapsed < TARGET_CHUNK_SECONDS / 2:
+                    chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+                elif elapsed > TARGET_CHUNK_SECONDS * 2:
+                    chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+    if total_size and downloaded != total_size:
+        raise IOError(f"Incomplete download: got {downloaded} of {total_size} bytes")
+    os.replace(part_path, dest_path)
+    write_archive_record(dest_path, hasher.hexdigest())
+    metrics.record("download.archive", time.perf_counter() - started, downloaded - resume_from)
+    return dest_path
+
+class DownloadJob:
+    def __init__(self, asset_id, resolution, url, zip_path, target_objects=(),
+                 swap_into=None, followup_resolution=None, fmt="PNG", maps=(), prefer_exr=False):
+        self.asset_id = asset_id
+        self.resolution = resolution
+        self.fmt = fmt
+        # Resolved on the main thread: the worker extracts these without reading bpy
+        self.maps = list(maps)
+        self.prefer_exr = prefer_exr
+        self.url = url
+        self.zip_path = zip_path
+        self.target_objects = list(target_objects)
+        # Progressive imports: the material whose images this job replaces,
+        # and the resolution to fetch once this one has been applied
+        self.swap_into = swap_into
+        self.followup_resolution = followup_resolution
+        self.state = "queued"
+        self.downloaded = 0
+        self.total_size = 0
+        self.error = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def key(self):
+        return get_asset_key(self.asset_id, self.resolution, self.fmt)
+
+    @property
+    def progress(self):
+        return self.downloaded / self.total_size if self.total_size else 0.0
+
+    @property
+    def finished(self):
+        return self.state in ("done", "failed", "cancelled")
+
+class DownloadManager:
+    def __init__(self, max_workers=MAX_CONCURRENT_DOWNLOADS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ambientcg-download")
+        self.limiter = BandwidthLimiter()
+        self.lock = threading.Lock()
+        self.jobs = {}
+
+    def submit(self, job):
+        with self.lock:
+            existing = self.jobs.get(job.key)
+            if existing is not None and not existing.finished:
+                existing.target_objects.extend(job.target_objects)
+                return existing
+            self.jobs[job.key] = job
+        self.executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        if job.cancel_event.is_set():
+            job.state = "cancelled"
+            return
         try:
-            preview = pcoll.load(url, image_path, 'IMAGE')
-            return preview.icon_id
+            # Waits while another process sharing the cache fetches the same asset
+            prepare_cache_entry(job, self.limiter)
+            job.state = "done"
+        except DownloadCancelled:
+            job.state = "cancelled"
         except Exception as e:
-            print(f"Failed to load preview image from URL {url}: {e}")
-            return 0
+            job.error = str(e)
+            job.state = "failed"
+
+    def get(self, key):
+        with self.lock:
+            return self.jobs.get(key)
+
+    def active_jobs(self):
+        with self.lock:
+            return [job for job in self.jobs.values() if not job.finished]
+
+    def pop_finished(self):
+        with self.lock:
+            finished = [job for job in self.jobs.values() if job.finished and job.state != "failed"]
+            for job in finished:
+                del self.jobs[job.key]
+        return finished
+
+    def has_unprocessed(self):
+        # Finished jobs that pop_finished hasn't handed out yet
+        with self.lock:
+            return any(job.finished and job.state != "failed" for job in self.jobs.values())
+
+    def failed_jobs(self):
+        with self.lock:
+            return [job for job in self.jobs.values() if job.state == "failed"]
+
+    def dismiss(self, key):
+        # Drops a failed job once its error has been seen
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and job.state == "failed":
+                del self.jobs[key]
+
+    def cancel(self, key):
+        job = self.get(key)
+        if job is not None:
+            job.cancel_event.set()
+
+    def shutdown(self):
+        with self.lock:
+            for job in self.jobs.values():
+                job.cancel_event.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+download_manager = None
+
+def get_download_manager():
+    global download_manager
+    if download_manager is None:
+        download_manager = DownloadManager()
+    return download_manager
+
+def get_asset_url(asset_name, resolution, fmt="PNG"):
+    return f"{AMBIENTCG_URL}/get?file={asset_name}_{resolution}-{fmt}.zip"
+
+def apply_material_to_objects(mat, object_names):
+    for name in object_names:
+        obj = bpy.data.objects.get(name)
+        if obj and len(obj.material_slots) == 1:
+            obj.material_slots[0].material = mat
+
+def queue_asset_download(asset_name, resolution, target_objects=(), swap_into=None, followup_resolution=None):
+    manager = get_download_manager()
+    prefs = get_addon_prefs()
+    manager.limiter.bytes_per_second = prefs.bandwidth_limit_kbps * 1024 if prefs else 0
+    fmt = resolve_texture_format(asset_name, resolution)
+    job = DownloadJob(
+        asset_name, resolution, get_asset_url(asset_name, resolution, fmt),
+        get_cache_dir() / f"{get_asset_key(asset_name, resolution, fmt)}.zip", target_objects,
+        swap_into, followup_resolution, fmt, get_wanted_maps(), prefer_exr_displacement(),
+    )
+    job = manager.submit(job)
+    if not bpy.app.timers.is_registered(poll_downloads):
+        bpy.app.timers.register(poll_downloads, first_interval=0.2)
+    return job
+
+def finish_download(manager, job):
+    # Builds (or upgrades) the material for a finished download on the main thread
+    if not is_import_ready(job.asset_id, job.resolution, job.maps, job.fmt, job.prefer_exr):
+        # Evicted or changed since the worker extracted it: let a worker prepare it again
+        queue_asset_download(job.asset_id, job.resolution, job.target_objects, job.swap_into, job.followup_resolution)
+        return
+    result = fetch_and_create_material(job.asset_id, job.resolution, job.maps, job.fmt, job.prefer_exr,
+                                       MAIN_THREAD_LOCK_TIMEOUT)
+    if isinstance(result, str) and "Failed" in result:
+        job.error = result
+        job.state = "failed"
+        with manager.lock:
+            manager.jobs[job.key] = job
+        print(result)
+        return
+    mat = bpy.data.materials.get(job.swap_into) if job.swap_into else None
+    if mat is not None:
+        texture_path, _ = get_texture_source(result)
+        swap_material_textures(mat, job.asset_id, job.resolution, texture_path, fmt=job.fmt)
+        print(f"Material '{mat.name}' upgraded to {job.resolution}")
+    else:
+        # A material that gets upgraded later must not be one shared with other imports
+        mat = import_material(job.asset_id, job.resolution, result, force_rebuild=bool(job.followup_resolution),
+                              fmt=job.fmt)
+        apply_material_to_objects(mat, job.target_objects)
+        print(f"Material '{job.asset_id}' created successfully!")
+    downloaded_assets[job.asset_id] = True
+    if job.followup_resolution:
+        queue_asset_download(job.asset_id, job.followup_resolution, swap_into=mat.name)
+    schedule_cache_eviction()
+
+def poll_downloads():
+    # Timer callback: turns finished downloads into materials on the main thread
+    manager = get_download_manager()
+    for job in manager.pop_finished():
+        if job.state == "done":
+            profile_call(job.asset_id, finish_download, manager, job)
+    redraw_panels()
+    # Jobs can finish while earlier ones are being imported; pick those up on the next tick
+    return 0.2 if manager.active_jobs() or manager.has_unprocessed() else None
+
+# -------------------------------------------------------------------
+# Speculative prefetch of the visible results
+# -------------------------------------------------------------------
+# The panel counts as idle once nobody has searched, paged or imported for this long
+PREFETCH_IDLE_SECONDS = 3.0
+PREFETCH_INTERVAL = 1.0
+last_activity = 0.0
+prefetcher = None
+
+def mark_activity():
+    global last_activity
+    last_activity = time.monotonic()
+    # Searches, paging and imports can change what's in the cache; check the results again
+    if prefetcher is not None:
+        prefetcher.forget_ready()
+
+class Prefetcher:
+    # Downloads and extracts archives one at a time on its own bandwidth cap. Cancelling keeps the
+    # .part file, so an interrupted prefetch resumes where it stopped next time
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ambientcg-prefetch")
+        self.limiter = BandwidthLimiter()
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.pending = set()
+        self.current = None
+        # key -> (asset_id, archive size) for everything prefetched this session
+        self.fetched = {}
+        self.failed = set()
+        # Keys the worker found complete in the cache, so the timer doesn't stat them again
+        self.ready = set()
+
+    @property
+    def busy(self):
+        with self.lock:
+            return bool(self.pending)
+
+    def submit(self, job):
+        with self.lock:
+            if job.key in self.pending:
+                return
+            self.pending.add(job.key)
+            generation = self.generation
+        self.executor.submit(self._run, job, generation)
+
+    def _run(self, job, generation):
+        with self.lock:
+            if generation != self.generation:
+                self.pending.discard(job.key)
+                return
+            self.current = job
+        try:
+            prepare_cache_entry(job, self.limiter)
+            if job.total_size:
+                # Only set when the archive was actually downloaded here
+                with self.lock:
+                    self.fetched[job.key] = (job.asset_id, job.zip_path.stat().st_size)
+                metrics.count("prefetch.archives")
+            with self.lock:
+                self.ready.add(job.key)
+            job.state = "done"
+        except DownloadCancelled:
+            job.state = "cancelled"
+        except Exception as e:
+            job.state = "failed"
+            with self.lock:
+                self.failed.add(job.key)
+            print(f"Failed to prefetch {job.key}: {e}")
+        finally:
+            with self.lock:
+                self.pending.discard(job.key)
+                if self.current is job:
+                    self.current = None
+
+    def cancel(self):
+        # Stops the running prefetch and drops the queued ones
+        with self.lock:
+            self.generation += 1
+            if self.current is not None:
+                self.current.cancel_event.set()
+
+    def unused_bytes(self):
+        # Prefetched archives the artist hasn't imported yet
+        with self.lock:
+            return sum(size for asset_id, size in self.fetched.values() if asset_id not in downloaded_assets)
+
+    def was_prefetched(self, key):
+        with self.lock:
+            return key in self.fetched
+
+    def is_ready(self, key):
+        with self.lock:
+            return key in self.ready
+
+    def forget_ready(self):
+        with self.lock:
+            self.ready.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def get_prefetcher():
+    global prefetcher
+    if prefetcher is None:
+        prefetcher = Prefetcher()
+    return prefetcher
+
+def prefetch_tick():
+    # Timer callback: queues the next visible result not known to be in the cache. The worker
+    # checks the cache itself, so slow or network cache folders never block the UI here
+    prefs = get_addon_prefs()
+    if prefs is None or not prefs.prefetch_enabled:
+        if prefetcher is not None:
+            prefetcher.cancel()
+        return PREFETCH_INTERVAL
+    fetcher = get_prefetcher()
+    manager = get_download_manager()
+    if manager.active_jobs():
+        # Real downloads get the whole connection
+        fetcher.cancel()
+        return PREFETCH_INTERVAL
+    if fetcher.busy or search_in_progress or time.monotonic() - last_activity < PREFETCH_IDLE_SECONDS:
+        return PREFETCH_INTERVAL
+    if fetcher.unused_bytes() >= prefs.prefetch_budget_mb * 1024 * 1024:
+        return PREFETCH_INTERVAL
+    scene = bpy.context.scene
+    if scene is None:
+        return PREFETCH_INTERVAL
+    fetcher.limiter.bytes_per_second = prefs.prefetch_bandwidth_kbps * 1024
+    resolution = scene.ambientcg_resolution
+    for asset_id, _, _, fmt, key in get_visible_items()[:prefs.prefetch_count]:
+        if asset_id in downloaded_assets:
+            continue
+        if key in fetcher.failed or manager.get(key) is not None or fetcher.is_ready(key):
+            continue
+        fetcher.submit(DownloadJob(
+            asset_id, resolution, get_asset_url(asset_id, resolution, fmt),
+            get_cache_dir() / f"{key}.zip", fmt=fmt, maps=get_wanted_maps(), prefer_exr=prefer_exr_displacement(),
+        ))
+        break
+    return PREFETCH_INTERVAL
 
 # -------------------------------------------------------------------
-# Async download operator with progress and material application
+# Download operators
 # -------------------------------------------------------------------
 class ASSET_OT_Download(bpy.types.Operator):
     bl_idname = "asset.download"
     bl_label = "Download Asset"
     
     asset_id: bpy.props.StringProperty()
-    
-    _timer = None
-    _download_thread = None
-    _total_size = 0
-    _downloaded = 0
-    _zip_path = ""
-    _download_finished = False
-    _download_error = None
+    force_rebuild: bpy.props.BoolProperty(
+        name="Force Rebuild",
+        description="Build a new material even if this asset is already in the file",
+        default=False,
+    )
+
+    def import_ready(self, asset_name, resolution, target_objects, force_rebuild=False):
+        fmt = resolve_texture_format(asset_name, resolution)
+        extract_path = fetch_and_create_material(asset_name, resolution, fmt=fmt, lock_timeout=MAIN_THREAD_LOCK_TIMEOUT)
+        if isinstance(extract_path, str):
+            self.report({"ERROR"}, extract_path)
+            return None
+        mat = import_material(asset_name, resolution, extract_path, force_rebuild=force_rebuild or self.force_rebuild,
+                              fmt=fmt)
+        downloaded_assets[asset_name] = True
+        apply_material_to_objects(mat, target_objects)
+        return mat
 
     def execute(self, context):
         asset_name = self.asset_id
         resolution = context.scene.ambientcg_resolution
-        cache_dir = get_cache_dir()
-        extract_path = cache_dir / f"{asset_name}_{resolution}"
-        if extract_path.exists():
-            mat = create_material_from_extracted(extract_path, asset_name)
-            downloaded_assets[asset_name] = True
-            obj = context.active_object
-            if obj and len(obj.material_slots) == 1:
-                obj.material_slots[0].material = mat
+        obj = context.active_object
+        target_objects = [obj.name] if obj and len(obj.material_slots) == 1 else []
+        mark_activity()
+        if prefetcher is not None:
+            key = get_asset_key(asset_name, resolution, resolve_texture_format(asset_name, resolution))
+            metrics.cache_lookup("prefetch", prefetcher.was_prefetched(key))
+        if is_import_ready(asset_name, resolution):
+            if profile_call(asset_name, self.import_ready, asset_name, resolution, target_objects) is None:
+                return {"CANCELLED"}
             self.report({"INFO"}, f"Material '{asset_name}' created using preexisting assets!")
             return {"FINISHED"}
-        url = f"https://ambientcg.com/get?file={asset_name}_{resolution}-PNG.zip"
-        context.scene.ambientcg_current_download = asset_name
-        context.scene.ambientcg_download_progress = 0.0
-        self._zip_path = str(cache_dir / f"{asset_name}_{resolution}.zip")
-        self._downloaded = 0
-        self._total_size = 0
-        self._download_finished = False
-        self._download_error = None
-        self._download_thread = threading.Thread(target=self.download_thread, args=(url,))
-        self._download_thread.start()
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
-        wm.modal_handler_add(self)
-        return {"RUNNING_MODAL"}
-    
-    def download_thread(self, url):
-        try:
-            r = requests.get(url, stream=True)
-            self._total_size = int(r.headers.get('content-length', 0))
-            with open(self._zip_path, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=1024):
-                    if chunk:
-                        f.write(chunk)
-                        self._downloaded += len(chunk)
-            self._download_finished = True
-        except Exception as e:
-            self._download_error = str(e)
-            self._download_finished = True
-
-    def modal(self, context, event):
-        if event.type == 'TIMER':
-            if self._total_size:
-                progress = self._downloaded / self._total_size
-            else:
-                progress = 0.0
-            context.scene.ambientcg_download_progress = progress
-            context.area.tag_redraw()
-            if self._download_finished:
-                wm = context.window_manager
-                wm.event_timer_remove(self._timer)
-                if self._download_error:
-                    self.report({"ERROR"}, f"Download error: {self._download_error}")
+        if context.scene.ambientcg_progressive and resolution != PROGRESSIVE_RESOLUTION:
+            # Give the artist a low resolution material now and swap the textures in later. It is
+            # always a new material: a 1K one already in the file may be used on purpose elsewhere
+            if is_import_ready(asset_name, PROGRESSIVE_RESOLUTION):
+                mat = self.import_ready(asset_name, PROGRESSIVE_RESOLUTION, target_objects, force_rebuild=True)
+                if mat is None:
                     return {"CANCELLED"}
-                context.scene.ambientcg_download_progress = 1.0
-                result = fetch_and_create_material(self.asset_id, context.scene.ambientcg_resolution)
-                if isinstance(result, str) and "Failed" in result:
-                    self.report({"ERROR"}, result)
-                    return {"CANCELLED"}
-                extract_path = result
-                mat = create_material_from_extracted(extract_path, self.asset_id)
-                downloaded_assets[self.asset_id] = True
-                obj = context.active_object
-                if obj and len(obj.material_slots) == 1:
-                    obj.material_slots[0].material = mat
-                self.report({"INFO"}, f"Material '{self.asset_id}' created successfully!")
-                return {"FINISHED"}
-        return {"RUNNING_MODAL"}
+                queue_asset_download(asset_name, resolution, swap_into=mat.name)
+            else:
+                queue_asset_download(asset_name, PROGRESSIVE_RESOLUTION, target_objects,
+                                     followup_resolution=resolution)
+            self.report({"INFO"}, f"Importing '{asset_name}' at {PROGRESSIVE_RESOLUTION}, {resolution} follows")
+            return {"FINISHED"}
+        queue_asset_download(asset_name, resolution, target_objects)
+        self.report({"INFO"}, f"Queued download of '{asset_name}' ({resolution})")
+        return {"FINISHED"}
+
+class ASSET_OT_CancelDownload(bpy.types.Operator):
+    bl_idname = "asset.cancel_download"
+    bl_label = "Cancel Download"
+
+    key: bpy.props.StringProperty()
+
+    def execute(self, context):
+        get_download_manager().cancel(self.key)
+        return {"FINISHED"}
+
+class ASSET_OT_DismissDownload(bpy.types.Operator):
+    bl_idname = "asset.dismiss_download"
+    bl_label = "Dismiss Download Error"
+
+    key: bpy.props.StringProperty()
+
+    def execute(self, context):
+        get_download_manager().dismiss(self.key)
+        return {"FINISHED"}
 
 # -------------------------------------------------------------------
 # Thumbnail loading system
 # -------------------------------------------------------------------
-def preload_thumbnails():
-    global preload_queue, preload_operator_running
-    if not preload_operator_running and assets:
-        preload_queue = [asset[2] for asset in assets]
-        preload_operator_running = True
-        bpy.app.timers.register(load_next_thumbnail, first_interval=0.1)
-
-def load_next_thumbnail():
-    global preload_queue, preload_operator_running
-    if not preload_queue:
-        preload_operator_running = False
+PRIORITY_VISIBLE = 0
+PRIORITY_BACKGROUND = 1
+
+class ThumbnailScheduler:
+    # Loads previews in priority order, as many per timer tick as the time budget allows.
+    # Download workers report back through `ready`, which is safe to append to from any thread.
+    def __init__(self):
+        self.heap = []
+        self.queued = {}
+        self.counter = itertools.count()
+        self.waiting = set()
+        self.ready = deque()
+
+    def request(self, url, priority=PRIORITY_BACKGROUND):
+        current = self.queued.get(url)
+        if current is not None and current <= priority:
+            return
+        # Lower-priority duplicates are skipped when popped
+        self.queued[url] = priority
+        heapq.heappush(self.heap, (priority, next(self.counter), url))
+
+    def reprioritize(self, visible_urls, other_urls=()):
+        self.heap = []
+        self.queued = {}
+        for url in visible_urls:
+            self.request(url, PRIORITY_VISIBLE)
+        for url in other_urls:
+            self.request(url, PRIORITY_BACKGROUND)
+
+    def notify_ready(self, url):
+        self.ready.append(url)
+
+    def clear(self):
+        self.heap = []
+        self.queued = {}
+        self.waiting.clear()
+        self.ready.clear()
+
+    @property
+    def idle(self):
+        return not self.heap and not self.ready and not self.waiting
+
+    def tick(self, budget_seconds):
+        deadline = time.perf_counter() + budget_seconds
+        changed = False
+        while self.ready and time.perf_counter() < deadline:
+            url = self.ready.popleft()
+            self.waiting.discard(url)
+            if load_cached_preview(url):
+                changed = True
+        while self.heap and time.perf_counter() < deadline:
+            priority, _, url = heapq.heappop(self.heap)
+            if self.queued.get(url) != priority:
+                continue
+            del self.queued[url]
+            if url in preview_collections["ambientcg"]:
+                touch_preview(url)
+                continue
+            hit = load_cached_preview(url)
+            metrics.cache_lookup("previews", hit)
+            if hit:
+                changed = True
+            elif request_preview_download(url):
+                self.waiting.add(url)
+        return changed
+
+thumbnail_scheduler = ThumbnailScheduler()
+
+def get_thumbnail_budget():
+    prefs = get_addon_prefs()
+    budget_ms = prefs.thumbnail_budget_ms if prefs else DEFAULT_THUMBNAIL_BUDGET_MS
+    return budget_ms / 1000.0
+
+def queue_thumbnails():
+    # Visible page first, then the rest of the result set
+    if "ambientcg" not in preview_collections:
+        return
+    visible = [item[1] for item in get_visible_items()]
+    for url in visible:
+        if url in preview_collections["ambientcg"]:
+            touch_preview(url)
+    thumbnail_scheduler.reprioritize(visible, (asset[2] for asset in assets))
+    if not bpy.app.timers.is_registered(load_thumbnails):
+        bpy.app.timers.register(load_thumbnails, first_interval=0.05)
+
+def load_thumbnails():
+    if thumbnail_scheduler.tick(get_thumbnail_budget()):
+        trim_previews()
+        redraw_panels()
+    if thumbnail_scheduler.idle:
+        schedule_cache_eviction()
         return None
-    url = preload_queue.pop(0)
-    pcoll = preview_collections["ambientcg"]
-    if url not in pcoll:
-        get_preview_icon(url)
-    # Force a redraw periodically
-    if len(preload_queue) % 5 == 0:
-        for area in bpy.context.window.screen.areas:
-            if area.type == 'VIEW_3D':
-                area.tag_redraw()
-    return 0.01 if preload_queue else None
+    # Poll more slowly while only waiting on downloads
+    return 0.02 if thumbnail_scheduler.heap or thumbnail_scheduler.ready else 0.1
+
+# -------------------------------------------------------------------
+# Local catalog index (token, prefix and typo-tolerant lookups)
+# -------------------------------------------------------------------
+token_pattern = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+def tokenize(text):
+    tokens = [token.lower() for token in token_pattern.findall(text)]
+    # Keep the whole word too so "pavingstones" matches "PavingStones092"
+    for word in re.split(r'[^A-Za-z0-9]+', text):
+        if word and word.lower() not in tokens:
+            tokens.append(word.lower())
+    return tokens
+
+def single_deletes(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+class CatalogIndex:
+    # Inverted index over every asset seen so far, persisted to the cache dir.
+    # Records keep first-seen order, which is AmbientCG's popularity order.
+    MIN_FUZZY_LENGTH = 4
+    FORMAT_VERSION = 2
+
+    def __init__(self):
+        self.records = {}
+        self.order = {}
+        self.postings = {}
+        self.deletes = {}
+        self._sorted_tokens = []
+        self._sorted_dirty = False
+        self.dirty = False
+
+    def add(self, asset):
+        asset = to_asset_record(asset)
+        asset_id = asset.id
+        if self.records.get(asset_id) == asset:
+            return
+        self.records[asset_id] = asset
+        self.order.setdefault(asset_id, len(self.order))
+        category = asset.category
+        if not category:
+            category_match = re.match(r'[A-Za-z]+', asset_id)
+            category = category_match.group(0) if category_match else ""
+        words = [asset_id, category] + list(asset.tags)
+        for token in {token for word in words for token in tokenize(word)}:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                self._sorted_dirty = True
+                if len(token) >= self.MIN_FUZZY_LENGTH:
+                    for variant in single_deletes(token):
+                        self.deletes.setdefault(variant, set()).add(token)
+            ids.add(asset_id)
+        self.dirty = True
+
+    def add_assets(self, new_assets):
+        for asset in new_assets:
+            self.add(asset)
+
+    def _tokens_with_prefix(self, prefix):
+        if self._sorted_dirty:
+            self._sorted_tokens = sorted(self.postings)
+            self._sorted_dirty = False
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def _match_token(self, query_token):
+        # Exact > prefix > one-edit typo
+        scores = {}
+        for asset_id in self.postings.get(query_token, ()):
+            scores[asset_id] = 3
+        for token in self._tokens_with_prefix(query_token):
+            for asset_id in self.postings[token]:
+                scores.setdefault(asset_id, 2)
+        if len(query_token) >= self.MIN_FUZZY_LENGTH:
+            candidates = set(self.deletes.get(query_token, ()))
+            for variant in single_deletes(query_token):
+                if variant in self.postings:
+                    candidates.add(variant)
+                candidates.update(self.deletes.get(variant, ()))
+            for token in candidates:
+                for asset_id in self.postings[token]:
+                    scores.setdefault(asset_id, 1)
+        return scores
+
+    def search(self, query):
+        query_tokens = [word.lower() for word in re.split(r'[^A-Za-z0-9]+', query) if word]
+        if not query_tokens:
+            return list(self.records.values())
+        total = None
+        for query_token in query_tokens:
+            scores = self._match_token(query_token)
+            if total is None:
+                total = scores
+            else:
+                total = {asset_id: total[asset_id] + score
+                         for asset_id, score in scores.items() if asset_id in total}
+            if not total:
+                return []
+        ranked = sorted(total, key=lambda asset_id: (-total[asset_id], self.order[asset_id]))
+        return [self.records[asset_id] for asset_id in ranked]
+
+    def load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.FORMAT_VERSION:
+                return
+            for asset in data["records"]:
+                self.add(asset)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        self.dirty = False
+
+    def save(self, path):
+        if not self.dirty:
+            return
+        records = sorted(self.records.values(), key=lambda record: self.order[record.id])
+        try:
+            write_json_atomic(path, {"version": self.FORMAT_VERSION, "records": records})
+            self.dirty = False
+        except OSError as e:
+            print(f"Failed to write catalog index: {e}")
+
+catalog_index = None
+
+def get_catalog_index():
+    global catalog_index
+    if catalog_index is None:
+        catalog_index = CatalogIndex()
+        catalog_index.load(get_cache_dir() / CATALOG_INDEX_NAME)
+    return catalog_index
+
+def index_assets(new_assets):
+    index = get_catalog_index()
+    index.add_assets(new_assets)
+    index.save(get_cache_dir() / CATALOG_INDEX_NAME)
+
+# -------------------------------------------------------------------
+# Search result cache, debounced background search and prefetch
+# -------------------------------------------------------------------
+SEARCH_CACHE_NAME = "search_cache.json"
+SEARCH_CACHE_TTL = 60 * 60
+SEARCH_CACHE_MAX_ENTRIES = 128
+SEARCH_DEBOUNCE = 0.4
+
+class SearchCache:
+    # LRU of search pages keyed by (query, sort, offset, count), mirrored to disk
+    def __init__(self, path, ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for key, fetched_at, page_assets, total_results in json.load(f):
+                    self.entries[tuple(key)] = (fetched_at, [to_asset_record(asset) for asset in page_assets], total_results)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    @staticmethod
+    def make_key(query, sort, offset, count):
+        return (query.strip().lower(), sort, offset, count)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self.entries[key]
+                metrics.cache_lookup("search", False)
+                return None
+            self.entries.move_to_end(key)
+            metrics.cache_lookup("search", True)
+            return entry[1], entry[2]
+
+    def contains(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and time.time() - entry[0] <= self.ttl
+
+    def put(self, key, page_assets, total_results):
+        with self.lock:
+            self.entries[key] = (time.time(), list(page_assets), total_results)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            data = [[list(key), fetched_at, page_assets, total]
+                    for key, (fetched_at, page_assets, total) in self.entries.items()]
+        try:
+            write_json_atomic(self.path, data)
+        except OSError as e:
+            print(f"Failed to write search cache: {e}")
+
+search_cache = None
+search_thread = None
+search_generation = 0
+search_pending = None
+search_error = None
+search_in_progress = False
+
+def get_search_cache():
+    global search_cache
+    if search_cache is None:
+        search_cache = SearchCache(get_cache_dir() / SEARCH_CACHE_NAME)
+    return search_cache
+
+def get_search_page(query, offset, count, sort=SEARCH_SORT):
+    cache = get_search_cache()
+    key = SearchCache.make_key(query, sort, offset, count)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    page_assets, total_results = get_catalog_client().search(query, offset, count, sort)
+    cache.put(key, page_assets, total_results)
+    return page_assets, total_results
+
+def prefetch_search_page(query, offset, count):
+    # Fills the cache for the next page so paging shows results instantly
+    key = SearchCache.make_key(query, SEARCH_SORT, offset, count)
+    if get_search_cache().contains(key):
+        return
+
+    def run():
+        try:
+            page_assets, total_results = get_catalog_client().search(query, offset, count)
+            get_search_cache().put(key, page_assets, total_results)
+        except Exception as e:
+            print(f"Failed to prefetch search page: {e}")
+
+    threading.Thread(target=run, daemon=True).start()
+
+def apply_search_page(query, page, page_assets, total_results, load_more):
+    global current_page, total_pages, original_assets, showing_startup_catalog
+    current_page = page
+    total_pages = max(1, (total_results + items_per_page - 1) // items_per_page)
+    showing_startup_catalog = False
+    index_assets(page_assets)
+    if load_more:
+        # Extend the current results and move on to the page that shows the new items
+        known = {asset[0] for asset in original_assets}
+        original_assets = original_assets + [asset for asset in page_assets if asset[0] not in known]
+        page_before = view_page
+        update_asset_search(query)
+        set_view_page(page_before + 1)
+    else:
+        original_assets = list(page_assets)
+        update_asset_search(query)
+    if current_page < total_pages:
+        prefetch_search_page(query, current_page * items_per_page, items_per_page)
+
+def start_search(query, load_more=False):
+    # Serves cached pages synchronously; anything else is fetched on a worker thread
+    global search_thread, search_generation, search_pending, search_error, search_in_progress
+    page = current_page + 1 if load_more else 1
+    offset = (page - 1) * items_per_page
+    key = SearchCache.make_key(query, SEARCH_SORT, offset, items_per_page)
+    search_generation += 1
+    cached = get_search_cache().get(key)
+    if cached is not None:
+        search_in_progress = False
+        apply_search_page(query, page, cached[0], cached[1], load_more)
+        return
+    generation = search_generation
+    search_pending = None
+    search_error = None
+    search_in_progress = True
+
+    def run():
+        global search_pending, search_error
+        try:
+            page_assets, total_results = get_catalog_client().search(query, offset, items_per_page)
+            get_search_cache().put(key, page_assets, total_results)
+            if generation == search_generation:
+                search_pending = (query, page, page_assets, total_results, load_more)
+        except Exception as e:
+            if generation == search_generation:
+                search_error = str(e)
+
+    search_thread = threading.Thread(target=run, daemon=True)
+    search_thread.start()
+    if not bpy.app.timers.is_registered(apply_pending_search):
+        bpy.app.timers.register(apply_pending_search, first_interval=0.1)
+
+def apply_pending_search():
+    # Timer callback: applies the worker's result on the main thread
+    global search_pending, search_in_progress
+    if search_thread is not None and search_thread.is_alive():
+        return 0.1
+    search_in_progress = False
+    if search_pending is not None:
+        pending = search_pending
+        search_pending = None
+        apply_search_page(*pending)
+    elif search_error:
+        print(f"Search failed: {search_error}")
+    redraw_panels()
+    return None
+
+def debounced_search():
+    start_search(bpy.context.scene.ambientcg_search_query)
+    return None
 
 # -------------------------------------------------------------------
 # Search-related functions
 # -------------------------------------------------------------------
 def update_asset_search(query):
-    global assets, search_query, preload_queue, preload_operator_running
+    global assets, search_query
     search_query = query.strip().lower()
     if not search_query:
         assets = original_assets.copy()
     else:
-        filtered = []
-        for asset in original_assets:
-            if search_query in asset[0].lower():
-                filtered.append(asset)
-        assets = filtered
-    # Clear out the preview collection so new thumbnails are loaded
-    if "ambientcg" in preview_collections:
-        preview_collections["ambientcg"].clear()
-    preload_queue = [asset[2] for asset in assets]
-    preload_operator_running = False
-    bpy.app.timers.register(load_next_thumbnail, first_interval=0.1)
+        # Search everything indexed so far, not only the last fetched page
+        assets = get_catalog_index().search(search_query)
+    rebuild_draw_model()
+    cancel_preview_downloads(asset[2] for asset in assets)
+    # Previews loaded for earlier searches stay in the collection and show right away
+    queue_thumbnails()
+
+def rebuild_draw_model(keep_page=False):
+    # Everything the panel needs per item, computed once per result set instead of per redraw:
+    # (id, thumbnail URL, info URL, texture format, download key) at the scene's resolution
+    global draw_model, view_page
+    scene = getattr(bpy.context, "scene", None)
+    resolution = getattr(scene, "ambientcg_resolution", "1K")
+    preferred = get_texture_format()
+    draw_model = []
+    for asset in assets:
+        fmt = resolve_texture_format(asset.id, resolution, preferred)
+        draw_model.append((asset.id, asset.thumbnail, f"{AMBIENTCG_URL}{asset.link}",
+                           fmt, get_asset_key(asset.id, resolution, fmt)))
+    view_page = min(view_page, get_view_page_count()) if keep_page else 1
+
+def get_view_page_count():
+    return max(1, (len(draw_model) + items_per_page - 1) // items_per_page)
+
+def get_visible_items():
+    start = (view_page - 1) * items_per_page
+    return draw_model[start:start + items_per_page]
+
+def set_view_page(page):
+    global view_page
+    view_page = max(1, min(page, get_view_page_count()))
+    mark_activity()
+    queue_thumbnails()
+    redraw_panels()
+
+def resolution_changed(self, context):
+    rebuild_draw_model(keep_page=True)
+
+def search_query_changed(self, context):
+    # Filter against the local index right away, then ask AmbientCG once typing settles
+    mark_activity()
+    if prefetcher is not None:
+        prefetcher.cancel()
+    update_asset_search(self.ambientcg_search_query)
+    if bpy.app.timers.is_registered(debounced_search):
+        bpy.app.timers.unregister(debounced_search)
+    bpy.app.timers.register(debounced_search, first_interval=SEARCH_DEBOUNCE)
 
 # -------------------------------------------------------------------
 # Panel with Search Bar and Pagination
@@ -341,52 +2879,167 @@ class ASSET_PT_Menu(bpy.types.Panel):
         row.prop(scene, "ambientcg_search_query", text="", icon='VIEWZOOM')
         row.operator("ambientcg.search", text="", icon='FILE_REFRESH').direction = ""
         
-        # pagination_row = col.row(align=True)
-        # if current_page > 1:
-        #     prev_op = pagination_row.operator("ambientcg.search", text="", icon='TRIA_LEFT', emboss=True)
-        #     prev_op.direction = "prev"
-        # else:
-        #     pagination_row.label(text="", icon='BLANK1')
-        # pagination_row.label(text=f"Page {current_page} of {total_pages}")
-        # if current_page < total_pages:
-        #     next_op = pagination_row.operator("ambientcg.search", text="", icon='TRIA_RIGHT', emboss=True)
-        #     next_op.direction = "next"
-        # else:
-        #     pagination_row.label(text="", icon='BLANK1')
-        
+        pagination_row = col.row(align=True)
+        if view_page > 1:
+            prev_op = pagination_row.operator("ambientcg.page", text="", icon='TRIA_LEFT', emboss=True)
+            prev_op.direction = "prev"
+        else:
+            pagination_row.label(text="", icon='BLANK1')
+        pagination_row.label(text=f"Page {view_page} of {get_view_page_count()}")
+        if view_page < get_view_page_count():
+            next_op = pagination_row.operator("ambientcg.page", text="", icon='TRIA_RIGHT', emboss=True)
+            next_op.direction = "next"
+        elif current_page < total_pages:
+            # Past the last local page: fetch the next page of results from AmbientCG
+            next_op = pagination_row.operator("ambientcg.search", text="", icon='TRIA_RIGHT', emboss=True)
+            next_op.direction = "next"
+        else:
+            pagination_row.label(text="", icon='BLANK1')
+        row = col.row(align=True)
+        row.prop(scene, "ambientcg_resolution", text="Resolution")
+        row.prop(scene, "ambientcg_progressive", text="", icon='RENDER_RESULT')
+
+        if search_in_progress:
+            layout.label(text="Searching AmbientCG...", icon='VIEWZOOM')
+        elif search_error:
+            layout.label(text=f"Search failed: {search_error}", icon='ERROR')
+        if catalog_refreshing:
+            layout.label(text="Refreshing catalog...", icon='FILE_REFRESH')
+        elif catalog_refresh_error and not assets:
+            layout.label(text="Catalog unavailable (offline?)", icon='ERROR')
         if search_query:
             layout.label(text=f"Showing results for: '{search_query}'", icon='FILTER')
+
+        manager = get_download_manager()
+        active_jobs = manager.active_jobs()
+        failed_jobs = manager.failed_jobs()
+        if active_jobs or failed_jobs:
+            box = layout.box()
+            for job in active_jobs:
+                row = box.row(align=True)
+                row.label(text=f"{job.key}: {int(job.progress * 100)}%", icon='IMPORT')
+                row.operator("asset.cancel_download", text="", icon='X').key = job.key
+            for job in failed_jobs:
+                row = box.row(align=True)
+                row.label(text=f"{job.key}: {job.error}", icon='ERROR')
+                row.operator("asset.dismiss_download", text="", icon='X').key = job.key
         
-        grid = layout.grid_flow(row_major=True, columns=0, even_columns=True, even_rows=True, align=True)
-        if not preload_operator_running:
-            preload_thumbnails()
         if not assets:
-            layout.label(text="No assets found matching your search", icon='INFO')
+            if not catalog_refreshing:
+                layout.label(text="No assets found matching your search", icon='INFO')
             return
-        for asset_id, asset_link, asset_img in assets:
+        # Only the current page is laid out, so draw cost doesn't grow with the result set
+        grid = layout.grid_flow(row_major=True, columns=0, even_columns=True, even_rows=True, align=True)
+        pcoll = preview_collections["ambientcg"]
+        for asset_id, asset_img, info_url, _, key in get_visible_items():
             col = grid.column(align=True)
             box = col.box()
-            pcoll = preview_collections["ambientcg"]
-            preview_loaded = asset_img in pcoll
-            if preview_loaded:
-                icon_id = pcoll[asset_img].icon_id
-                box.template_icon(icon_value=icon_id, scale=5)
+            preview = pcoll.get(asset_img)
+            if preview is not None:
+                box.template_icon(icon_value=preview.icon_id, scale=5)
             else:
                 box.label(text="Loading Preview...", icon='IMAGE_DATA')
             row = box.row()
             learn_op = row.operator("url.open", text=asset_id, icon='INFO')
-            learn_op.url = f"https://ambientcg.com{asset_link}"
-            row = box.row()
-            row.prop(scene, "ambientcg_resolution", text="Resolution")
+            learn_op.url = info_url
             row = box.row()
+            job = manager.get(key)
             if asset_id in downloaded_assets:
                 row.label(text="Downloaded", icon='CHECKMARK')
-            elif scene.ambientcg_current_download == asset_id:
-                row.label(text=f"Downloading: {int(scene.ambientcg_download_progress * 100)}%", icon='IMPORT')
+                apply_op = row.operator("asset.download", text="", icon='MATERIAL')
+                apply_op.asset_id = asset_id
+                rebuild_op = row.operator("asset.download", text="", icon='FILE_REFRESH')
+                rebuild_op.asset_id = asset_id
+                rebuild_op.force_rebuild = True
+            elif job is not None and not job.finished:
+                row.label(text=f"Downloading: {int(job.progress * 100)}%", icon='IMPORT')
             else:
                 download_op = row.operator("asset.download", text="Download", icon='IMPORT')
                 download_op.asset_id = asset_id
 
+class ASSET_PT_Stats(bpy.types.Panel):
+    bl_label = "Performance"
+    bl_idname = "ASSET_PT_stats"
+    bl_parent_id = "ASSET_PT_menu"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = 'Assets'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        row = layout.row(align=True)
+        row.operator("ambientcg.export_stats", text="Export", icon='EXPORT')
+        row.operator("ambientcg.reset_stats", text="Reset", icon='TRASH')
+        row.operator("ambientcg.profile_import", text="Profile Next Import", icon='TIME', depress=profile_next_import)
+        if last_profile_path:
+            layout.label(text=f"Last profile: {os.path.basename(last_profile_path)}", icon='FILE')
+        snapshot = metrics.snapshot()
+        if not snapshot["stages"] and not snapshot["caches"]:
+            layout.label(text="Nothing recorded yet", icon='INFO')
+            return
+        if snapshot["caches"]:
+            box = layout.box()
+            for cache, rate in snapshot["caches"].items():
+                box.label(text=f"{cache}: {rate['rate']:.0%} hits ({rate['hits']}/{rate['lookups']})")
+        box = layout.box()
+        for stage, summary in snapshot["stages"].items():
+            col = box.column(align=True)
+            col.label(text=f"{stage} ({summary['count']})")
+            text = f"p50 {summary['p50_ms']:.0f} ms, p90 {summary['p90_ms']:.0f} ms, max {summary['max_ms']:.0f} ms"
+            if "mb_per_s" in summary:
+                text += f", {summary['mb_per_s']:.1f} MB/s"
+            col.label(text=text)
+
+class AMBIENTCG_OT_ExportStats(bpy.types.Operator, ExportHelper):
+    bl_idname = "ambientcg.export_stats"
+    bl_label = "Export AmbientCG Stats"
+    bl_description = "Write the collected timings and cache hit rates to a JSON file"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def execute(self, context):
+        try:
+            with open(self.filepath, "w", encoding="utf-8") as f:
+                json.dump(metrics.snapshot(), f, indent=2)
+        except OSError as e:
+            self.report({"ERROR"}, f"Failed to export stats: {e}")
+            return {"CANCELLED"}
+        self.report({"INFO"}, f"Stats written to {self.filepath}")
+        return {"FINISHED"}
+
+class AMBIENTCG_OT_ResetStats(bpy.types.Operator):
+    bl_idname = "ambientcg.reset_stats"
+    bl_label = "Reset AmbientCG Stats"
+
+    def execute(self, context):
+        metrics.reset()
+        redraw_panels()
+        return {"FINISHED"}
+
+class AMBIENTCG_OT_ProfileImport(bpy.types.Operator):
+    bl_idname = "ambientcg.profile_import"
+    bl_label = "Profile Next Import"
+    bl_description = "Capture a cProfile of the next material import into the cache folder"
+
+    def execute(self, context):
+        global profile_next_import
+        profile_next_import = not profile_next_import
+        if profile_next_import:
+            self.report({"INFO"}, "The next import will be profiled")
+        return {"FINISHED"}
+
+class AMBIENTCG_OT_Page(bpy.types.Operator):
+    bl_idname = "ambientcg.page"
+    bl_label = "Change AmbientCG Page"
+
+    direction: bpy.props.StringProperty(default="next")
+
+    def execute(self, context):
+        set_view_page(view_page + (1 if self.direction == "next" else -1))
+        return {'FINISHED'}
+
 # -------------------------------------------------------------------
 # Search Operator with Pagination
 # -------------------------------------------------------------------
@@ -397,58 +3050,27 @@ class AMBIENTCG_OT_Search(bpy.types.Operator):
     direction: bpy.props.StringProperty(default="")
     
     def execute(self, context):
-        global current_page, total_pages
-        scene = context.scene
-        if self.direction == "next":
-            current_page += 1
-        elif self.direction == "prev":
-            current_page = max(1, current_page - 1)
-        else:
-            current_page = 1
-        offset = (current_page - 1) * items_per_page
-        ASSET_LIST_URL = (
-            f"https://ambientcg.com/hx/asset-list?"
-            f"q={scene.ambientcg_search_query}"
-            f"&colorMode=&thumbnails=200&sort=popular"
-            f"&offset={offset}&count={items_per_page}"
-        )
-        try:
-            response = requests.get(ASSET_LIST_URL)
-            asset_pattern = re.compile(r'<div class="asset-block" id="asset-([^"]+)">')
-            link_pattern = re.compile(r'<a\s+href="(/view\?id=[^"]+)">')
-            img_pattern = re.compile(r'<img[^>]+class="only-show-dark"[^>]+src="([^"]+)"')
-            total_pattern = re.compile(r'Showing \d+ - \d+ of (\d+) results')
-            total_match = total_pattern.search(response.text)
-            total_results = int(total_match.group(1)) if total_match else 0
-            total_pages = max(1, (total_results + items_per_page - 1) // items_per_page)
-            global assets, original_assets
-            assets = []
-            for match in zip(asset_pattern.finditer(response.text),
-                             link_pattern.finditer(response.text),
-                             img_pattern.finditer(response.text)):
-                asset_id = match[0].group(1)
-                # Filter out HDRIs and Substance materials
-                if "hdri" in asset_id.lower() or "substance" in asset_id.lower():
-                    continue
-                asset_link = match[1].group(1)
-                asset_img = match[2].group(1)
-                assets.append((asset_id, asset_link, asset_img))
-            original_assets = assets.copy()
-            update_asset_search(scene.ambientcg_search_query)
-        except Exception as e:
-            self.report({'ERROR'}, f"Search failed: {str(e)}")
+        mark_activity()
+        if bpy.app.timers.is_registered(debounced_search):
+            bpy.app.timers.unregister(debounced_search)
+        start_search(context.scene.ambientcg_search_query, load_more=self.direction == "next")
         return {'FINISHED'}
 
 # -------------------------------------------------------------------
 # Registration
 # -------------------------------------------------------------------
-classes = [URL_OT_Open, ASSET_OT_Download, ASSET_PT_Menu, AMBIENTCG_OT_Search]
+classes = [
+    URL_OT_Open, ASSET_OT_Download, ASSET_OT_CancelDownload, ASSET_OT_DismissDownload, ASSET_PT_Menu, ASSET_PT_Stats,
+    AMBIENTCG_OT_Search, AMBIENTCG_OT_Page, AMBIENTCG_OT_ExportStats, AMBIENTCG_OT_ResetStats, AMBIENTCG_OT_ProfileImport,
+    AMBIENTCG_OT_PurgeCache, AMBIENTCG_AddonPreferences,
+]
 
 def register():
     bpy.types.Scene.ambientcg_search_query = bpy.props.StringProperty(
         name="Search",
         description="Search for AmbientCG assets",
-        default=""
+        default="",
+        update=search_query_changed
     )
     for cls in classes:
         bpy.utils.register_class(cls)
@@ -462,29 +3084,75 @@ def register():
             ("8K", "8K", "8K resolution"),
         ],
         default="1K",
+        update=resolution_changed,
     )
-    bpy.types.Scene.ambientcg_current_download = bpy.props.StringProperty(default="")
-    bpy.types.Scene.ambientcg_download_progress = bpy.props.FloatProperty(default=0.0, min=0.0, max=1.0)
-    global preview_collections
+    bpy.types.Scene.ambientcg_progressive = bpy.props.BoolProperty(
+        name="Progressive Import",
+        description="Apply a 1K version right away and swap in the chosen resolution once it has downloaded",
+        default=False,
+    )
+    apply_shared_cache_root(get_addon_prefs())
+    global preview_collections, original_assets
     pcoll = bpy.utils.previews.new()
     preview_collections["ambientcg"] = pcoll
+    # Show the last known catalog immediately and refresh it off the main thread
+    snapshot_assets, is_fresh = load_catalog_snapshot()
+    if snapshot_assets:
+        original_assets = snapshot_assets
+        get_catalog_index().add_assets(snapshot_assets)
+        update_asset_search("")
+    if not is_fresh:
+        refresh_catalog_async()
+    bpy.app.timers.register(startup_cache_maintenance, first_interval=5.0)
+    bpy.app.timers.register(prefetch_tick, first_interval=PREFETCH_INTERVAL, persistent=True)
 
 def unregister():
-    global preload_queue, preload_operator_running
-    preload_queue = []
-    preload_operator_running = False
-    if bpy.app.timers.is_registered(load_next_thumbnail):
-        bpy.app.timers.unregister(load_next_thumbnail)
+    thumbnail_scheduler.clear()
+    if bpy.app.timers.is_registered(load_thumbnails):
+        bpy.app.timers.unregister(load_thumbnails)
+    if bpy.app.timers.is_registered(apply_catalog_refresh):
+        bpy.app.timers.unregister(apply_catalog_refresh)
+    if bpy.app.timers.is_registered(startup_cache_maintenance):
+        bpy.app.timers.unregister(startup_cache_maintenance)
+    if bpy.app.timers.is_registered(poll_downloads):
+        bpy.app.timers.unregister(poll_downloads)
+    for timer in (debounced_search, apply_pending_search, poll_conversions, prefetch_tick):
+        if bpy.app.timers.is_registered(timer):
+            bpy.app.timers.unregister(timer)
+    if cache_manager is not None:
+        cache_manager.save()
     for cls in classes:
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.ambientcg_search_query
     del bpy.types.Scene.ambientcg_resolution
-    del bpy.types.Scene.ambientcg_current_download
-    del bpy.types.Scene.ambientcg_download_progress
+    del bpy.types.Scene.ambientcg_progressive
     global preview_collections
     for pcoll in preview_collections.values():
         bpy.utils.previews.remove(pcoll)
     preview_collections.clear()
+    preview_lru.clear()
+    global preview_executor, http_session, download_manager, prefetcher
+    if download_manager is not None:
+        download_manager.shutdown()
+        download_manager = None
+    if prefetcher is not None:
+        prefetcher.shutdown()
+        prefetcher = None
+    cancel_preview_downloads()
+    if preview_executor is not None:
+        preview_executor.shutdown(wait=False, cancel_futures=True)
+        preview_executor = None
+    if http_session is not None:
+        http_session.close()
+        http_session = None
+    global thumbnail_store, thumbnail_scratch_dir
+    if thumbnail_store is not None:
+        thumbnail_store.save()
+        thumbnail_store.close_map()
+        thumbnail_store = None
+    if thumbnail_scratch_dir is not None:
+        shutil.rmtree(thumbnail_scratch_dir, ignore_errors=True)
+        thumbnail_scratch_dir = None
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,184 @@
+# Headless batch importer: builds .blend material libraries from AmbientCG assets.
+#
+#   blender -b --factory-startup --python batch_import.py -- \
+#       --ids Bricks059,Wood051 --resolution 2K --output ~/libs/ambientcg.blend
+#
+# Finished assets are recorded in a state file next to the output, so re-running
+# the same command after an interruption only imports what is still missing.
+# Set AMBIENTCG_URL to run against a local mirror. Render nodes can share one
+# --cache-dir (or AMBIENTCG_CACHE_DIR): each archive is then downloaded once.
+import os
+import sys
+import json
+import time
+import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import bpy
+
+ADDON_DIR = Path(__file__).resolve().parent
+
+def load_addon():
+    # The folder name isn't a valid module name, so load the package from its path
+    spec = importlib.util.spec_from_file_location(
+        "ambientcg_addon", ADDON_DIR / "__init__.py", submodule_search_locations=[str(ADDON_DIR)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(
+        prog="batch_import.py", description="Build .blend material libraries from AmbientCG assets"
+    )
+    parser.add_argument("--ids", default="", help="Comma separated asset IDs")
+    parser.add_argument("--ids-file", help="File with one asset ID per line")
+    parser.add_argument("--query", help="Import the results of this AmbientCG search")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of search results to import")
+    parser.add_argument("--resolution", default="1K", help="Comma separated resolutions, e.g. 1K,4K")
+    parser.add_argument("--format", default="PNG", choices=["PNG", "JPG"])
+    parser.add_argument("--maps", default="", help="Comma separated maps, defaults to the addon's map set")
+    parser.add_argument("--output", required=True, help="Library .blend to write")
+    parser.add_argument("--per-file", type=int, default=0, help="Split the library into files of this many materials")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel downloads")
+    parser.add_argument("--pack", action="store_true", help="Pack textures into the .blend instead of linking the cache")
+    parser.add_argument("--state", help="Progress file, defaults to <output>.state.json")
+    parser.add_argument("--cache-dir", help="Cache folder, e.g. one shared by all render nodes")
+    return parser.parse_args(argv)
+
+def collect_asset_ids(args, addon):
+    asset_ids = [asset_id.strip() for asset_id in args.ids.split(",") if asset_id.strip()]
+    if args.ids_file:
+        with open(args.ids_file, "r", encoding="utf-8") as f:
+            asset_ids += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if args.query is not None:
+        client = addon.get_catalog_client()
+        offset = 0
+        while offset < args.limit:
+            records, total = client.search(args.query, offset, min(100, args.limit - offset))
+            asset_ids += [record.id for record in records]
+            addon.get_catalog_index().add_assets(records)
+            offset += 100
+            if offset >= total or not records:
+                break
+    # Keep order, drop duplicates
+    return list(dict.fromkeys(asset_ids))
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"done": {}, "files": []}
+
+def save_state(path, state):
+    tmp_path = Path(str(path) + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, path)
+
+def state_key(asset_id, resolution, fmt, maps):
+    # A different format or map set is a different import, so it isn't skipped on restart
+    return f"{asset_id}|{resolution}|{fmt}|{','.join(sorted(maps))}"
+
+def archive_bytes(addon):
+    # Bytes actually transferred so far; archives found in the cache add nothing
+    return addon.metrics.snapshot()["stages"].get("download.archive", {}).get("bytes", 0)
+
+def output_path_for(output, index, per_file):
+    output = Path(output)
+    if not per_file:
+        return output
+    return output.with_name(f"{output.stem}_{index:03d}{output.suffix}")
+
+def write_library(path, materials, pack):
+    if pack:
+        for mat in materials:
+            for node in mat.node_tree.nodes:
+                if node.type == 'TEX_IMAGE' and node.image and not node.image.packed_file:
+                    node.image.pack()
+    for mat in materials:
+        mat.asset_mark()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    bpy.data.libraries.write(str(path), set(materials), fake_user=True, compress=True)
+
+def main():
+    args = parse_args(sys.argv)
+    if args.cache_dir:
+        os.environ["AMBIENTCG_CACHE_DIR"] = args.cache_dir
+    addon = load_addon()
+    asset_ids = collect_asset_ids(args, addon)
+    resolutions = [resolution.strip() for resolution in args.resolution.split(",") if resolution.strip()]
+    maps = [m.strip() for m in args.maps.split(",") if m.strip()] or addon.get_wanted_maps()
+    state_path = Path(args.state or f"{args.output}.state.json")
+    state = load_state(state_path)
+    todo = [(asset_id, resolution) for asset_id in asset_ids for resolution in resolutions
+            if state_key(asset_id, resolution, args.format, maps) not in state["done"]]
+    print(f"AmbientCG batch: {len(todo)} to import, {len(asset_ids) * len(resolutions) - len(todo)} already done")
+    if not todo:
+        return
+
+    started = time.perf_counter()
+    bytes_before = archive_bytes(addon)
+    extracted = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(addon.fetch_and_create_material, asset_id, resolution, maps, args.format, False):
+            (asset_id, resolution)
+            for asset_id, resolution in todo
+        }
+        for future in as_completed(futures):
+            asset_id, resolution = futures[future]
+            result = future.result()
+            if isinstance(result, str):
+                failures.append((asset_id, resolution, result))
+                print(f"  {asset_id} {resolution}: {result}")
+                continue
+            extracted.append((asset_id, resolution, result))
+            print(f"  {asset_id} {resolution}: ready")
+    fetch_seconds = time.perf_counter() - started
+    downloaded_bytes = archive_bytes(addon) - bytes_before
+
+    # Materials are built on the main thread, in the requested order
+    order = {key: i for i, key in enumerate(todo)}
+    extracted.sort(key=lambda item: order[(item[0], item[1])])
+    per_file = args.per_file or len(extracted)
+    file_index = len(state["files"]) + 1
+    for start in range(0, len(extracted), max(1, per_file)):
+        chunk = extracted[start:start + per_file]
+        materials = []
+        for asset_id, resolution, extract_path in chunk:
+            mat = addon.import_material(asset_id, resolution, extract_path, maps, fmt=args.format)
+            if len(resolutions) > 1:
+                mat.name = f"{asset_id}_{resolution}"
+            materials.append(mat)
+        path = output_path_for(args.output, file_index, args.per_file)
+        if path.exists() and not args.per_file:
+            # Restarted single-file run: keep what was written before next to the new file
+            path = output_path_for(args.output, file_index, True)
+        write_library(path, materials, args.pack)
+        for asset_id, resolution, _ in chunk:
+            state["done"][state_key(asset_id, resolution, args.format, maps)] = str(path)
+        state["files"].append(str(path))
+        save_state(state_path, state)
+        file_index += 1
+        print(f"  wrote {len(materials)} materials to {path}")
+    addon.get_cache_manager().save()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"AmbientCG batch: {len(extracted)} imported, {len(failures)} failed in {elapsed:.1f}s "
+        f"({len(extracted) / elapsed:.2f} assets/s, "
+        f"{downloaded_bytes / (1024 * 1024):.1f} MB downloaded at "
+        f"{downloaded_bytes / (1024 * 1024) / max(fetch_seconds, 1e-6):.1f} MB/s)"
+    )
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
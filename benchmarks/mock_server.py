@@ -0,0 +1,384 @@
+# Local stand-in for ambientcg.com used by the benchmarks and batch importer tests.
+#
+#   python benchmarks/mock_server.py --port 8765 --assets 2000 --latency-ms 40 --bandwidth-kbps 20000
+#
+# Serves the v2 JSON API (synthetic, or a recorded response via --fixture; "{base_url}"
+# in the fixture is replaced with this server's address, see fixtures/full_json.json),
+# PNG thumbnails and synthetic texture zips (real PNG or baseline JPEG maps) with HTTP
+# Range support.
+# GET /__stats returns request and byte counters as JSON.
+import io
+import re
+import json
+import math
+import time
+import zlib
+import struct
+import random
+import zipfile
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+RESOLUTION_PIXELS = {"1K": 1024, "2K": 2048, "4K": 4096, "8K": 8192}
+ARCHIVE_MAPS = ("Color", "Roughness", "NormalGL", "NormalDX", "Displacement", "AmbientOcclusion")
+
+def make_png(width, height, seed=0, noise=1.0):
+    # RGB PNG; `noise` is the share of random rows, which controls how well it compresses
+    rng = random.Random(seed)
+    flat_row = b"\x00" + bytes([seed % 256, 128, 64]) * width
+    rows = []
+    for y in range(height):
+        if rng.random() < noise:
+            rows.append(b"\x00" + rng.randbytes(width * 3))
+        else:
+            rows.append(flat_row)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(b"".join(rows), 1)) + chunk(b"IEND", b""))
+
+# Baseline JPEG tables: the standard luminance quantization and Huffman tables from
+# Annex K, shared by all three components
+JPEG_LUMA_QUANT = (
+    16, 11, 10, 16, 24, 40, 51, 61, 12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56, 14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77, 24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101, 72, 92, 95, 98, 112, 100, 103, 99,
+)
+JPEG_DC_BITS = (0, 1, 5, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0)
+JPEG_DC_VALUES = tuple(range(12))
+JPEG_AC_BITS = (0, 2, 1, 3, 3, 2, 4, 3, 5, 5, 4, 4, 0, 0, 1, 0x7D)
+JPEG_AC_VALUES = bytes.fromhex(
+    "01020300041105122131410613516107227114328191a1082342b1c11552d1f0"
+    "2433627282090a161718191a25262728292a3435363738393a43444546474849"
+    "4a535455565758595a636465666768696a737475767778797a838485868788898a"
+    "92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7"
+    "c8c9cad2d3d4d5d6d7d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9fa"
+)
+JPEG_ZIGZAG = tuple(y * 8 + x for y, x in sorted(
+    ((y, x) for y in range(8) for x in range(8)),
+    key=lambda p: (p[0] + p[1], p[0] if (p[0] + p[1]) % 2 else -p[0])))
+
+def huffman_codes(bits, values):
+    # Canonical codes: symbol -> (code, length)
+    codes = {}
+    code = 0
+    values = iter(values)
+    for length, count in enumerate(bits, 1):
+        for _ in range(count):
+            codes[next(values)] = (code, length)
+            code += 1
+        code <<= 1
+    return codes
+
+def jpeg_magnitude(value):
+    # Size category and the extra bits that encode a coefficient
+    size = abs(value).bit_length()
+    return size, (value if value >= 0 else value + (1 << size) - 1)
+
+def jpeg_ac_symbols(coefficients, ac_codes):
+    # Run-length and Huffman code the 63 AC coefficients of one quantized, zigzagged block
+    out = []
+    run = 0
+    for value in coefficients[1:]:
+        if value == 0:
+            run += 1
+            continue
+        while run > 15:
+            out.append(ac_codes[0xF0])
+            run -= 16
+        size, extra = jpeg_magnitude(value)
+        code, length = ac_codes[(run << 4) | size]
+        out.append(((code << size) | extra, length + size))
+        run = 0
+    if run:
+        out.append(ac_codes[0x00])
+    return out
+
+def make_jpg(width, height, seed=0, noise=1.0, quality=90):
+    # Baseline YCbCr JPEG; `noise` is the share of 8x8 luma blocks drawn from a set of random
+    # patterns instead of a flat tone. Chroma is flat, as in most grayscale-ish PBR maps.
+    rng = random.Random(seed)
+    scale = 5000 // quality if quality < 50 else 200 - 2 * quality
+    quant = [min(255, max(1, (q * scale + 50) // 100)) for q in JPEG_LUMA_QUANT]
+    dc_codes = huffman_codes(JPEG_DC_BITS, JPEG_DC_VALUES)
+    ac_codes = huffman_codes(JPEG_AC_BITS, JPEG_AC_VALUES)
+    cosines = [[math.cos((2 * x + 1) * u * math.pi / 16) * (math.sqrt(0.5) if u == 0 else 1.0)
+                for x in range(8)] for u in range(8)]
+
+    def encode_block(pixels):
+        # Forward DCT, quantization and zigzag: returns (DC, AC symbols)
+        shifted = [p - 128 for p in pixels]
+        rows = [[sum(shifted[y * 8 + x] * cosines[u][x] for x in range(8)) / 2 for u in range(8)] for y in range(8)]
+        coefficients = [0] * 64
+        for v in range(8):
+            for u in range(8):
+                value = sum(rows[y][u] * cosines[v][y] for y in range(8)) / 2
+                coefficients[v * 8 + u] = round(value / quant[v * 8 + u])
+        zigzagged = [coefficients[i] for i in JPEG_ZIGZAG]
+        return zigzagged[0], jpeg_ac_symbols(zigzagged, ac_codes)
+
+    def flat_dc(value):
+        return round(8 * (value - 128) / quant[0])
+
+    base = rng.randrange(64, 192)
+    patterns = [encode_block([min(255, max(0, base + rng.randrange(-48, 49))) for _ in range(64)])
+                for _ in range(32)]
+    flat = (flat_dc(base), [ac_codes[0x00]])
+    chroma = [(flat_dc(rng.randrange(96, 160)), [ac_codes[0x00]]) for _ in range(2)]
+
+    data = bytearray()
+    acc = 0
+    nbits = 0
+    predictors = [0, 0, 0]
+
+    def write(code, length):
+        nonlocal acc, nbits
+        acc = (acc << length) | code
+        nbits += length
+        while nbits >= 8:
+            nbits -= 8
+            byte = (acc >> nbits) & 0xFF
+            data.append(byte)
+            if byte == 0xFF:
+                data.append(0)
+        acc &= (1 << nbits) - 1
+
+    for _ in range(((height + 7) // 8) * ((width + 7) // 8)):
+        luma = rng.choice(patterns) if rng.random() < noise else flat
+        for component, (dc, symbols) in enumerate((luma, *chroma)):
+            size, extra = jpeg_magnitude(dc - predictors[component])
+            predictors[component] = dc
+            code, length = dc_codes[size]
+            write((code << size) | extra, length + size)
+            for code, length in symbols:
+                write(code, length)
+    if nbits:
+        write((1 << (8 - nbits)) - 1, 8 - nbits)
+
+    def segment(marker, payload):
+        return struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+
+    def huffman_table(table_class, bits, values):
+        return bytes([table_class << 4]) + bytes(bits) + bytes(values)
+
+    frame = struct.pack(">BHHB", 8, height, width, 3) + b"".join(bytes([i, 0x11, 0]) for i in (1, 2, 3))
+    scan = bytes([3]) + b"".join(bytes([i, 0x00]) for i in (1, 2, 3)) + bytes([0, 63, 0])
+    return (b"\xff\xd8"
+            + segment(0xDB, bytes([0]) + bytes(quant[i] for i in JPEG_ZIGZAG))
+            + segment(0xC0, frame)
+            + segment(0xC4, huffman_table(0, JPEG_DC_BITS, JPEG_DC_VALUES)
+                      + huffman_table(1, JPEG_AC_BITS, JPEG_AC_VALUES))
+            + segment(0xDA, scan) + bytes(data) + b"\xff\xd9")
+
+def make_exr(width, height, seed=0):
+    # Uncompressed single channel float EXR, one scanline per chunk
+    rng = random.Random(seed)
+
+    def attribute(name, kind, value):
+        return name.encode() + b"\x00" + kind.encode() + b"\x00" + struct.pack("<i", len(value)) + value
+
+    window = struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    header = (b"\x76\x2f\x31\x01" + struct.pack("<i", 2)
+              + attribute("channels", "chlist", b"Y\x00" + struct.pack("<iB3xii", 2, 0, 1, 1) + b"\x00")
+              + attribute("compression", "compression", b"\x00")
+              + attribute("dataWindow", "box2i", window)
+              + attribute("displayWindow", "box2i", window)
+              + attribute("lineOrder", "lineOrder", b"\x00")
+              + attribute("pixelAspectRatio", "float", struct.pack("<f", 1.0))
+              + attribute("screenWindowCenter", "v2f", struct.pack("<ff", 0.0, 0.0))
+              + attribute("screenWindowWidth", "float", struct.pack("<f", 1.0))
+              + b"\x00")
+    row_size = width * 4
+    first_chunk = len(header) + height * 8
+    offsets = b"".join(struct.pack("<Q", first_chunk + y * (8 + row_size)) for y in range(height))
+    rows = [struct.pack("<ii", y, row_size) + struct.pack(f"<{width}f", *(rng.random() for _ in range(width)))
+            for y in range(height)]
+    return header + offsets + b"".join(rows)
+
+class MockAmbientCG:
+    def __init__(self, asset_count=500, latency=0.0, bandwidth=0, texture_scale=0.125, fixture=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.texture_scale = texture_scale
+        self.base_url = ""
+        self.lock = threading.Lock()
+        self.stats = {"requests": {}, "bytes_sent": 0, "downloads": {}}
+        self.zip_cache = {}
+        self.thumbnail_cache = {}
+        self.fixture = None
+        if fixture:
+            with open(fixture, "r", encoding="utf-8") as f:
+                self.fixture = f.read()
+        categories = ["Bricks", "Wood", "WoodFloor", "Metal", "PavingStones", "Fabric", "Ground", "Rock", "Tiles"]
+        self.asset_ids = [f"{categories[i % len(categories)]}{i // len(categories) + 1:03d}" for i in range(asset_count)]
+
+    def count(self, kind, key=None):
+        with self.lock:
+            self.stats["requests"][kind] = self.stats["requests"].get(kind, 0) + 1
+            if key is not None:
+                self.stats["downloads"][key] = self.stats["downloads"].get(key, 0) + 1
+
+    def found_asset(self, asset_id):
+        downloads = [
+            {"attribute": f"{resolution}-{fmt}", "fullDownloadPath": f"{self.base_url}/get?file={asset_id}_{resolution}-{fmt}.zip"}
+            for resolution in RESOLUTION_PIXELS for fmt in ("JPG", "PNG")
+        ]
+        return {
+            "assetId": asset_id,
+            "dataType": "Material",
+            "displayCategory": re.match(r"[A-Za-z]+", asset_id).group(0),
+            "tags": [re.match(r"[A-Za-z]+", asset_id).group(0).lower(), "synthetic"],
+            "previewImage": {"256-PNG": f"{self.base_url}/thumb/{asset_id}.png"},
+            "downloadFolders": {"default": {"downloadFiletypeCategories": {"zip": {"downloads": downloads}}}},
+        }
+
+    def search(self, params):
+        if self.fixture is not None:
+            return json.loads(self.fixture.replace("{base_url}", self.base_url))
+        query = params.get("q", [""])[0].lower()
+        offset = int(params.get("offset", ["0"])[0])
+        limit = int(params.get("limit", ["20"])[0])
+        matches = [asset_id for asset_id in self.asset_ids if query in asset_id.lower()]
+        page = matches[offset:offset + limit]
+        return {"numberOfResults": len(matches), "foundAssets": [self.found_asset(asset_id) for asset_id in page]}
+
+    def thumbnail(self, asset_id):
+        with self.lock:
+            data = self.thumbnail_cache.get(asset_id)
+        if data is None:
+            data = make_png(64, 64, seed=hash(asset_id) & 0xFFFF)
+            with self.lock:
+                self.thumbnail_cache[asset_id] = data
+        return data
+
+    def archive(self, name):
+        # "Bricks001_2K-PNG.zip" -> synthetic zip with maps, a preview and sidecar files
+        with self.lock:
+            data = self.zip_cache.get(name)
+        if data is not None:
+            return data
+        match = re.match(r"(.+)_(\dK)-(PNG|JPG)\.zip$", name)
+        if not match:
+            return None
+        asset_id, resolution, fmt = match.groups()
+        size = max(8, int(RESOLUTION_PIXELS[resolution] * self.texture_scale))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            encode = make_jpg if fmt == "JPG" else make_png
+            for i, map_name in enumerate(ARCHIVE_MAPS):
+                zf.writestr(f"{asset_id}_{resolution}-{fmt}_{map_name}.{fmt.lower()}", encode(size, size, seed=i, noise=0.5))
+            # Archives also carry a 32-bit displacement next to the 8-bit one
+            zf.writestr(f"{asset_id}_{resolution}-{fmt}_Displacement.exr", make_exr(size, size))
+            zf.writestr(f"{asset_id}.png", make_png(64, 64))
+            zf.writestr(f"{asset_id}_{resolution}-{fmt}.usdc", b"#usda 1.0\n" * 200)
+            zf.writestr(f"{asset_id}_{resolution}-{fmt}.mtlx", b"<materialx/>\n" * 200)
+        data = buffer.getvalue()
+        with self.lock:
+            self.zip_cache[name] = data
+        return data
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def send_body(self, data, content_type, status=200, headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Accept-Ranges", "bytes")
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            sent = 0
+            started = time.monotonic()
+            chunk_size = 64 * 1024
+            while sent < len(data):
+                piece = data[sent:sent + chunk_size]
+                try:
+                    self.wfile.write(piece)
+                except (BrokenPipeError, ConnectionResetError):
+                    break
+                sent += len(piece)
+                if mock.bandwidth:
+                    ahead = sent / mock.bandwidth - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            with mock.lock:
+                mock.stats["bytes_sent"] += sent
+
+        def do_GET(self):
+            if mock.latency:
+                time.sleep(mock.latency)
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path == "/__stats":
+                with mock.lock:
+                    body = json.dumps(mock.stats).encode()
+                return self.send_body(body, "application/json")
+            if url.path == "/api/v2/full_json":
+                mock.count("api")
+                return self.send_body(json.dumps(mock.search(params)).encode(), "application/json")
+            if url.path.startswith("/thumb/"):
+                mock.count("thumbnail")
+                asset_id = url.path[len("/thumb/"):].rsplit(".", 1)[0]
+                return self.send_body(mock.thumbnail(asset_id), "image/png")
+            if url.path == "/get":
+                name = params.get("file", [""])[0]
+                data = mock.archive(name)
+                if data is None:
+                    return self.send_body(b"not found", "text/plain", 404)
+                range_header = self.headers.get("Range")
+                match = re.match(r"bytes=(\d+)-$", range_header or "")
+                if match:
+                    start = int(match.group(1))
+                    mock.count("archive_range", name)
+                    if start >= len(data):
+                        return self.send_body(b"", "application/zip", 416, [("Content-Range", f"bytes */{len(data)}")])
+                    return self.send_body(data[start:], "application/zip", 206,
+                                          [("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")])
+                mock.count("archive", name)
+                return self.send_body(data, "application/zip")
+            self.send_body(b"not found", "text/plain", 404)
+
+    return Handler
+
+def start_server(port=0, **options):
+    # Returns (server, mock); the server runs on a daemon thread until server.shutdown()
+    mock = MockAmbientCG(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(mock))
+    server.daemon_threads = True
+    mock.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, mock
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the AmbientCG endpoints the addon uses")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--assets", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="Per-response cap, 0 for unlimited")
+    parser.add_argument("--texture-scale", type=float, default=0.125, help="Map size relative to the nominal resolution")
+    parser.add_argument("--fixture", help="Recorded full_json response to serve for every search")
+    args = parser.parse_args()
+    server, mock = start_server(
+        args.port, asset_count=args.assets, latency=args.latency_ms / 1000.0,
+        bandwidth=args.bandwidth_kbps * 1024, texture_scale=args.texture_scale, fixture=args.fixture,
+    )
+    print(f"Mock AmbientCG on {mock.base_url} (set AMBIENTCG_URL={mock.base_url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Records a full_json listing from ambientcg.com for the mock server's --fixture option.
+#
+#   python benchmarks/record_fixture.py --count 2000 --output benchmarks/fixtures/full_json.json
+#
+# Pages through the v2 API with the parameters the addon sends and rewrites every URL to
+# "{base_url}" paths the mock server answers (/get?file=... and /thumb/<id>.png), so the
+# recorded listing can be served offline. Without network access, --expand grows an
+# existing fixture to --count entries by renumbering copies of its assets instead.
+import re
+import sys
+import json
+import argparse
+
+API_URL = "https://ambientcg.com/api/v2/full_json"
+PAGE_SIZE = 100
+USER_AGENT = "ambientcg-addon-benchmarks"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Record an AmbientCG full_json fixture")
+    parser.add_argument("--count", type=int, default=2000, help="Assets to record")
+    parser.add_argument("--query", default="")
+    parser.add_argument("--type", default="Material", help="Comma separated data types")
+    parser.add_argument("--sort", default="Popular")
+    parser.add_argument("--output", default="benchmarks/fixtures/full_json.json")
+    parser.add_argument("--expand", help="Fixture to grow offline instead of recording")
+    return parser.parse_args()
+
+def rewrite_urls(asset):
+    # Downloads keep their file name; every preview size points at the mock's thumbnail route
+    asset_id = asset["assetId"]
+    for size in list(asset.get("previewImage") or {}):
+        asset["previewImage"][size] = f"{{base_url}}/thumb/{asset_id}.png"
+    text = json.dumps(asset)
+    text = re.sub(r"https?://(?:www\.)?ambientcg\.com", "{base_url}", text)
+    return json.loads(text)
+
+def record(args):
+    import requests
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    found = []
+    total = None
+    while len(found) < args.count and (total is None or len(found) < total):
+        response = session.get(API_URL, params={
+            "q": args.query, "type": args.type, "sort": args.sort,
+            "limit": min(PAGE_SIZE, args.count - len(found)), "offset": len(found),
+            "include": "tagData,previewData,downloadData,displayData",
+        }, timeout=60)
+        response.raise_for_status()
+        page = response.json()
+        total = page.get("numberOfResults", 0)
+        if not page.get("foundAssets"):
+            break
+        found += [rewrite_urls(asset) for asset in page["foundAssets"]]
+        print(f"recorded {len(found)} of {min(total, args.count)}")
+    return found
+
+def expand(path, count):
+    # Copies get the next free number of their category, e.g. Bricks059 -> Bricks101
+    with open(path, "r", encoding="utf-8") as f:
+        seeds = json.load(f)["foundAssets"]
+    used = {asset["assetId"] for asset in seeds}
+    found = list(seeds)
+    next_number = {}
+    while len(found) < count:
+        for seed in seeds:
+            if len(found) >= count:
+                break
+            match = re.match(r"(\D+)(\d+)([A-Z]?)$", seed["assetId"])
+            if not match:
+                continue
+            prefix = match.group(1)
+            number = next_number.get(prefix, 1)
+            while f"{prefix}{number:03d}{match.group(3)}" in used:
+                number += 1
+            next_number[prefix] = number + 1
+            asset_id = f"{prefix}{number:03d}{match.group(3)}"
+            used.add(asset_id)
+            asset = json.loads(json.dumps(seed).replace(seed["assetId"], asset_id))
+            if "displayName" in asset:
+                asset["displayName"] = re.sub(r"\d+([A-Z]?)$", f"{number:03d}\\1", asset["displayName"])
+            found.append(asset)
+    return found
+
+def main():
+    args = parse_args()
+    found = expand(args.expand, args.count) if args.expand else record(args)
+    listing = {
+        "searchQuery": {"q": args.query, "type": args.type, "sort": args.sort, "limit": len(found), "offset": 0},
+        "numberOfResults": len(found),
+        "nextPageHttp": None,
+        "foundAssets": found,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(listing, f, separators=(",", ":"))
+    print(f"wrote {len(found)} assets to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# Background-Blender check that repeated imports reuse datablocks: importing one asset at
+# one resolution several times must leave a single material and load every texture once,
+# and a forced rebuild must add a second material that shares the same images.
+#
+#   blender -b --factory-startup --python benchmarks/reuse_check.py -- --imports 5
+import os
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+from collections import Counter
+
+import bpy
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import mock_server
+from run_benchmarks import load_addon
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="reuse_check.py", description="AmbientCG material/image reuse check")
+    parser.add_argument("--imports", type=int, default=5, help="Times the same asset is imported")
+    parser.add_argument("--resolution", default="1K")
+    return parser.parse_args(argv)
+
+def import_asset(addon, asset_id, force_rebuild=False):
+    bpy.ops.asset.download(asset_id=asset_id, force_rebuild=force_rebuild)
+    manager = addon.get_download_manager()
+    # Drive the timer callback by hand: background mode has no event loop
+    while addon.poll_downloads() is not None or manager.active_jobs():
+        time.sleep(0.02)
+
+def imported_materials(key):
+    return [mat for mat in bpy.data.materials if mat.get("ambientcg_key") == key]
+
+def cached_images(cache_dir):
+    # Images loaded from the AmbientCG cache, counted per file on disk
+    cache_dir = os.path.normpath(str(cache_dir))
+    paths = (os.path.normpath(bpy.path.abspath(image.filepath)) for image in bpy.data.images if image.filepath)
+    return Counter(path for path in paths if path.startswith(cache_dir))
+
+def main():
+    args = parse_args(sys.argv)
+    workdir = Path(tempfile.mkdtemp(prefix="ambientcg-reuse-"))
+    server, mock = mock_server.start_server(asset_count=20)
+    # Both are read when the addon module is imported
+    os.environ["AMBIENTCG_URL"] = mock.base_url
+    os.environ["AMBIENTCG_CACHE_DIR"] = str(workdir / "cache")
+    addon = load_addon()
+    addon.register()
+    failures = []
+    try:
+        bpy.context.scene.ambientcg_resolution = args.resolution
+        bpy.context.scene.ambientcg_progressive = False
+        asset_id = mock.asset_ids[0]
+        fmt = addon.resolve_texture_format(asset_id, args.resolution)
+        key = addon.get_import_key(asset_id, args.resolution, addon.get_wanted_maps(), fmt)
+        cache_dir = addon.get_cache_dir()
+
+        for _ in range(args.imports):
+            import_asset(addon, asset_id)
+        materials = imported_materials(key)
+        images = cached_images(cache_dir)
+        print(f"{args.imports} imports: {len(materials)} materials, {len(images)} images")
+        if len(materials) != 1:
+            failures.append(f"expected 1 material after {args.imports} imports, found {len(materials)}")
+        if not images:
+            failures.append("no texture images were loaded")
+        duplicates = sorted(path for path, count in images.items() if count > 1)
+        if duplicates:
+            failures.append(f"images loaded more than once: {duplicates}")
+
+        import_asset(addon, asset_id, force_rebuild=True)
+        rebuilt = imported_materials(key)
+        after = cached_images(cache_dir)
+        print(f"force rebuild: {len(rebuilt)} materials, {len(after)} images")
+        if len(rebuilt) != len(materials) + 1:
+            failures.append(f"force rebuild should add one material, found {len(rebuilt)}")
+        if after != images:
+            failures.append("force rebuild loaded new images instead of reusing them")
+        downloads = mock.stats["downloads"]
+        if any(count > 1 for count in downloads.values()):
+            failures.append(f"archives downloaded more than once: {downloads}")
+    finally:
+        addon.unregister()
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+    print("reuse check passed" if not failures else "reuse check failed")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+# Offline benchmark suite: drives the addon's real code paths against the local mock server.
+#
+#   blender -b --factory-startup --python benchmarks/run_benchmarks.py -- --output bench.json
+#
+# Prints and writes a JSON report with latency percentiles and throughput per stage,
+# so results from different commits can be compared.
+import os
+import sys
+import json
+import time
+import shutil
+import zipfile
+import tempfile
+import argparse
+import itertools
+import platform
+import subprocess
+import importlib.util
+from pathlib import Path
+from types import SimpleNamespace
+
+import bpy
+
+BENCH_DIR = Path(__file__).resolve().parent
+ADDON_DIR = BENCH_DIR.parent / "ambientcg-addon"
+sys.path.insert(0, str(BENCH_DIR))
+
+import mock_server
+
+DEFAULT_FIXTURE = BENCH_DIR / "fixtures" / "full_json.json"
+DRAW_CATALOG_SIZES = (100, 1000, 10000)
+# The "Downscale Maps To" preference values
+CONVERT_SIZES = (1024, 2048, 4096)
+
+def parse_args(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="run_benchmarks.py", description="AmbientCG addon benchmarks")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--catalog-size", type=int, default=2000, help="Assets served by the mock server")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--bandwidth-kbps", type=int, default=0)
+    parser.add_argument("--texture-scale", type=float, default=0.125)
+    parser.add_argument("--fixture", help="Recorded full_json response to serve instead of synthetic listings")
+    parser.add_argument("--thumbnails", type=int, default=200)
+    parser.add_argument("--downloads", type=int, default=6)
+    parser.add_argument("--resolution", default="1K")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--extract-resolutions", default="4K,8K", help="Comma separated resolutions of the extraction benchmark")
+    parser.add_argument("--extract-assets", type=int, default=3, help="Assets extracted at each of those resolutions")
+    parser.add_argument("--convert-resolution", default="4K", help="Resolution downscaled by the conversion benchmark")
+    parser.add_argument("--conversions", type=int, default=2, help="Assets downscaled by the conversion benchmark")
+    return parser.parse_args(argv)
+
+def load_addon():
+    spec = importlib.util.spec_from_file_location(
+        "ambientcg_addon", ADDON_DIR / "__init__.py", submodule_search_locations=[str(ADDON_DIR)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def summarize(samples, work=None, unit=None):
+    # samples are seconds; work/unit describe throughput over their sum
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+
+    def percentile(p):
+        index = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    summary = {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(50),
+        "p90_ms": percentile(90),
+        "p99_ms": percentile(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+    if work is not None:
+        summary[f"{unit}_per_s"] = work / max(sum(ordered), 1e-9)
+    return summary
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+def wait_for(condition, timeout=120.0, interval=0.005):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("benchmark step timed out")
+        time.sleep(interval)
+
+def bench_catalog(addon, args, results, mock):
+    client = addon.get_catalog_client()
+    samples = []
+    records = []
+    for i in range(args.repeat):
+        elapsed, (records, _) = timed(client.search, "", i * 20, 20)
+        samples.append(elapsed)
+    results["catalog_fetch"] = summarize(samples)
+
+    # Parse cost alone, on the recorded listing (--fixture, or the one shipped with the benchmarks)
+    with open(args.fixture or DEFAULT_FIXTURE, "r", encoding="utf-8") as f:
+        recorded = json.loads(f.read().replace("{base_url}", mock.base_url))
+    samples = [timed(client.parse, recorded)[0] for _ in range(args.repeat)]
+    results["catalog_parse"] = summarize(samples, len(recorded.get("foundAssets", ())) * len(samples), "records")
+
+    # Records for the other benchmarks: one listing of --catalog-size assets from the mock
+    payload = addon.get_http_session().get(
+        addon.CATALOG_API_URL, params=client.build_params("", 0, args.catalog_size, addon.SEARCH_SORT)
+    ).json()
+    return client.parse(payload)[0]
+
+def bench_search(addon, args, results, all_records):
+    index = addon.get_catalog_index()
+    elapsed, _ = timed(index.add_assets, all_records)
+    results["index_build"] = summarize([elapsed], len(all_records), "records")
+    queries = ["wood", "wo", "brick", "bircks", "paving stones", "metal 01", "tiles", "synthetic", "zzz"]
+    samples = []
+    for _ in range(args.repeat):
+        for query in queries:
+            samples.append(timed(addon.update_asset_search, query)[0])
+    results["update_asset_search"] = summarize(samples)
+    samples = []
+    for _ in range(args.repeat):
+        for query in queries:
+            samples.append(timed(index.search, query)[0])
+    results["index_search"] = summarize(samples)
+
+def bench_thumbnails(addon, args, results, all_records):
+    urls = [record.thumbnail for record in all_records[:args.thumbnails]]
+    started = time.perf_counter()
+    for url in urls:
+        addon.get_preview_icon(url)
+    wait_for(lambda: not addon.preview_download_futures)
+    elapsed = time.perf_counter() - started
+    results["thumbnail_download"] = {"count": len(urls), "seconds": elapsed, "previews_per_s": len(urls) / elapsed}
+
+    # Decode/load through the scheduler, one timer tick at a time
+    addon.preview_collections["ambientcg"].clear()
+    addon.preview_lru.clear()
+    addon.thumbnail_scheduler.reprioritize(urls)
+    budget = addon.get_thumbnail_budget()
+    samples = []
+    while not addon.thumbnail_scheduler.idle:
+        samples.append(timed(addon.thumbnail_scheduler.tick, budget)[0])
+        if len(samples) > 100000:
+            break
+    loaded = len(addon.preview_collections["ambientcg"])
+    results["thumbnail_tick"] = summarize(samples, loaded, "previews")
+
+class NullLayout:
+    # Stands in for UILayout so the panel's draw code can run in background mode
+    def __getattr__(self, name):
+        return self.element
+
+    def element(self, *args, **kwargs):
+        return NullLayout()
+
+def bench_draw(addon, args, results, all_records):
+    # Panel cost against result set size: model rebuild, page slicing and one full draw
+    panel = SimpleNamespace(layout=NullLayout())
+    saved_assets = addon.assets
+    try:
+        for size in DRAW_CATALOG_SIZES:
+            addon.assets = [record._replace(id=f"{record.id}_{i}")
+                            for i, record in zip(range(size), itertools.cycle(all_records))]
+            rebuild = [timed(addon.rebuild_draw_model)[0] for _ in range(args.repeat)]
+            visible = [timed(addon.get_visible_items)[0] for _ in range(args.repeat)]
+            items = len(addon.get_visible_items())
+            draw = [timed(addon.ASSET_PT_Menu.draw, panel, bpy.context)[0] for _ in range(args.repeat)]
+            results[f"draw_{size}"] = {
+                "rebuild_draw_model": summarize(rebuild, size * len(rebuild), "items"),
+                "get_visible_items": summarize(visible),
+                "panel_draw": summarize(draw, items * len(draw), "items"),
+            }
+    finally:
+        addon.assets = saved_assets
+        addon.rebuild_draw_model()
+
+def bench_downloads(addon, args, results, all_records, mock):
+    asset_ids = [record.id for record in all_records[:args.downloads]]
+    bpy.context.scene.ambientcg_resolution = args.resolution
+    bpy.context.scene.ambientcg_progressive = False
+    bytes_before = mock.stats["bytes_sent"]
+    started = time.perf_counter()
+    for asset_id in asset_ids:
+        bpy.ops.asset.download(asset_id=asset_id)
+    manager = addon.get_download_manager()
+    # Drive the timer callback by hand: background mode has no event loop
+    while addon.poll_downloads() is not None or manager.active_jobs():
+        time.sleep(0.02)
+    elapsed = time.perf_counter() - started
+    transferred = mock.stats["bytes_sent"] - bytes_before
+    results["asset_download_and_import"] = {
+        "count": len(asset_ids),
+        "seconds": elapsed,
+        "assets_per_s": len(asset_ids) / elapsed,
+        "mb_per_s": transferred / (1024 * 1024) / elapsed,
+        "failed": [job.key for job in manager.failed_jobs()],
+    }
+    return asset_ids
+
+def fetch_archive(addon, mock, asset_id, resolution, fmt):
+    # Archives the import didn't download are fetched straight into the cache
+    zip_path = addon.get_cache_dir() / f"{addon.get_asset_key(asset_id, resolution, fmt)}.zip"
+    if not zip_path.exists():
+        addon.download_file(f"{mock.base_url}/get?file={asset_id}_{resolution}-{fmt}.zip", zip_path)
+    return zip_path
+
+def extract_all(zip_path, extract_path):
+    # What the addon did before selective extraction: every member of the archive
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        zip_ref.extractall(extract_path)
+    return [path for path in Path(extract_path).rglob("*") if path.is_file()]
+
+def bench_extract_and_build(addon, args, results, asset_ids, mock):
+    # Selective extraction against extracting the whole archive at each --extract-resolutions:
+    # bytes written, extraction and material build time, and time to the first material
+    maps = addon.get_wanted_maps()
+    asset_ids = asset_ids[:args.extract_assets]
+    extractors = (("selective", lambda zip_path, path: addon.extract_maps(zip_path, path, maps)),
+                  ("extractall", extract_all))
+    for resolution in args.extract_resolutions.split(","):
+        zip_paths = [(asset_id, fetch_archive(addon, mock, asset_id, resolution, "PNG")) for asset_id in asset_ids]
+        for mode, extract in extractors:
+            extract_samples = []
+            build_samples = []
+            written = 0
+            first_material = None
+            for asset_id, zip_path in zip_paths:
+                extract_path = zip_path.with_name(f"{zip_path.stem}-{mode}")
+                shutil.rmtree(extract_path, ignore_errors=True)
+                extracted, files = timed(extract, zip_path, extract_path)
+                written += sum(Path(path).stat().st_size for path in files)
+                built, _ = timed(addon.create_material_from_extracted, extract_path, asset_id, maps)
+                extract_samples.append(extracted)
+                build_samples.append(built)
+                if first_material is None:
+                    first_material = extracted + built
+            results[f"extract_{resolution}_{mode}"] = {
+                "zip_extraction": summarize(extract_samples),
+                "material_build": summarize(build_samples),
+                "bytes_written": written,
+                "first_material_ms": (first_material or 0) * 1000,
+            }
+
+def load_pixels(path):
+    # images.load is lazy; reading a pixel forces the decode
+    image = bpy.data.images.load(str(path))
+    image.pixels[0]
+    return image
+
+def bench_displacement_formats(addon, args, results, asset_ids):
+    # Bytes on disk and load time of the displacement map, 8-bit against EXR
+    cache_dir = addon.get_cache_dir()
+    for prefer_exr, label in ((False, "displacement_8bit"), (True, "displacement_exr")):
+        samples = []
+        on_disk = 0
+        for asset_id in asset_ids:
+            key = addon.get_asset_key(asset_id, args.resolution, "PNG")
+            zip_path = cache_dir / f"{key}.zip"
+            if not zip_path.exists():
+                continue
+            extract_path = cache_dir / f"{key}-displacement"
+            shutil.rmtree(extract_path, ignore_errors=True)
+            addon.extract_maps(zip_path, extract_path, ["Displacement"], prefer_exr)
+            path = extract_path / addon.find_map_files(extract_path, prefer_exr)["Displacement"]
+            on_disk += path.stat().st_size
+            elapsed, image = timed(load_pixels, path)
+            samples.append(elapsed)
+            bpy.data.images.remove(image)
+            shutil.rmtree(extract_path, ignore_errors=True)
+        results[label] = summarize(samples)
+        results[label]["bytes_on_disk"] = on_disk
+
+def measure_maps(folder, names):
+    # Returns (bytes on disk, load time per map)
+    on_disk = 0
+    samples = []
+    for name in names:
+        path = Path(folder) / name
+        on_disk += path.stat().st_size
+        elapsed, image = timed(load_pixels, path)
+        samples.append(elapsed)
+        bpy.data.images.remove(image)
+    return on_disk, samples
+
+def bench_texture_formats(addon, args, results, asset_ids, mock):
+    # Bytes on disk and load time of the wanted maps, PNG against JPG archives
+    maps = addon.get_wanted_maps()
+    for fmt in addon.TEXTURE_FORMATS:
+        samples = []
+        on_disk = 0
+        archive_bytes = 0
+        for asset_id in asset_ids:
+            zip_path = fetch_archive(addon, mock, asset_id, args.resolution, fmt)
+            archive_bytes += zip_path.stat().st_size
+            extract_path = zip_path.with_name(f"{zip_path.stem}-formats")
+            shutil.rmtree(extract_path, ignore_errors=True)
+            addon.extract_maps(zip_path, extract_path, maps)
+            size, loads = measure_maps(extract_path, addon.find_map_files(extract_path, False).values())
+            on_disk += size
+            samples.extend(loads)
+            shutil.rmtree(extract_path, ignore_errors=True)
+        label = f"texture_{fmt.lower()}"
+        results[label] = summarize(samples)
+        results[label]["bytes_on_disk"] = on_disk
+        results[label]["archive_bytes"] = archive_bytes
+
+def bench_conversion(addon, args, results, asset_ids, mock):
+    # Downscaled against original maps: conversion time, bytes on disk and load time. The mock
+    # scales its textures by --texture-scale, so the size limits are scaled the same way.
+    resolution = args.convert_resolution
+    map_size = max(8, int(mock_server.RESOLUTION_PIXELS[resolution] * args.texture_scale))
+    limits = [(size, max(1, int(size * args.texture_scale))) for size in CONVERT_SIZES]
+    limits = [(size, limit) for size, limit in limits if limit < map_size]
+    maps = addon.get_wanted_maps()
+    measured = {"original": ([], 0)}
+    convert_samples = {size: [] for size, _ in limits}
+    failed = 0
+    for asset_id in asset_ids[:args.conversions]:
+        zip_path = fetch_archive(addon, mock, asset_id, resolution, "PNG")
+        extract_path = zip_path.with_name(f"{zip_path.stem}-convert")
+        shutil.rmtree(extract_path, ignore_errors=True)
+        addon.extract_maps(zip_path, extract_path, maps)
+        names = sorted(addon.find_map_files(extract_path, False).values())
+        targets = [("original", extract_path)]
+        for size, limit in limits:
+            converted_path = extract_path / f"converted_{size}"
+            # Same command the addon runs, Blender startup included
+            elapsed, process = timed(
+                subprocess.run,
+                [bpy.app.binary_path, "-b", "--factory-startup", "--python-expr", addon.CONVERT_SCRIPT,
+                 "--", str(extract_path), str(converted_path), str(limit), *names],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            if process.returncode != 0:
+                failed += 1
+                continue
+            convert_samples[size].append(elapsed)
+            targets.append((size, converted_path))
+        for label, folder in targets:
+            samples, on_disk = measured.setdefault(label, ([], 0))
+            size, loads = measure_maps(folder, names)
+            measured[label] = (samples + loads, on_disk + size)
+        shutil.rmtree(extract_path, ignore_errors=True)
+    for label, (samples, on_disk) in measured.items():
+        entry = summarize(samples)
+        entry["bytes_on_disk"] = on_disk
+        if label != "original":
+            entry["conversion"] = summarize(convert_samples[label])
+        results[f"convert_{resolution}_{label}"] = entry
+    results[f"convert_{resolution}_original"]["failed_conversions"] = failed
+
+def bench_resume(addon, results, mock):
+    # Interrupt a transfer half way, then check the Range resume produces the same file
+    name = "Bricks001_1K-PNG.zip"
+    url = f"{mock.base_url}/get?file={name}"
+    data = mock.archive(name)
+    dest = addon.get_cache_dir() / "resume_test.zip"
+    part = dest.with_name(dest.name + ".part")
+    part.write_bytes(data[:len(data) // 2])
+    elapsed, _ = timed(addon.download_file, url, dest)
+    results["range_resume"] = {"seconds": elapsed, "correct": dest.read_bytes() == data}
+    dest.unlink()
+
+def main():
+    args = parse_args(sys.argv)
+    workdir = Path(tempfile.mkdtemp(prefix="ambientcg-bench-"))
+    server, mock = mock_server.start_server(
+        asset_count=args.catalog_size, latency=args.latency_ms / 1000.0,
+        bandwidth=args.bandwidth_kbps * 1024, texture_scale=args.texture_scale, fixture=args.fixture,
+    )
+    # Both are read when the addon module is imported
+    os.environ["AMBIENTCG_URL"] = mock.base_url
+    os.environ["AMBIENTCG_CACHE_DIR"] = str(workdir / "cache")
+    addon = load_addon()
+    addon.register()
+    results = {}
+    try:
+        all_records = bench_catalog(addon, args, results, mock)
+        bench_search(addon, args, results, all_records)
+        bench_thumbnails(addon, args, results, all_records)
+        bench_draw(addon, args, results, all_records)
+        asset_ids = bench_downloads(addon, args, results, all_records, mock)
+        bench_extract_and_build(addon, args, results, asset_ids, mock)
+        bench_displacement_formats(addon, args, results, asset_ids)
+        bench_texture_formats(addon, args, results, asset_ids, mock)
+        bench_conversion(addon, args, results, asset_ids, mock)
+        bench_resume(addon, results, mock)
+        addon_metrics = addon.metrics.snapshot()
+    finally:
+        addon.unregister()
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "blender": bpy.app.version_string,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": vars(args),
+        },
+        "results": results,
+        "addon_metrics": addon_metrics,
+        "server": mock.stats["requests"],
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Multi-process check for the shared cache: starts many headless batch importers at once
+# against the mock server, all using the same cache folder, and verifies that every
+# archive was downloaded exactly once.
+#
+#   python benchmarks/shared_cache.py --blender /path/to/blender --processes 8
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+BATCH_SCRIPT = BENCH_DIR.parent / "ambientcg-addon" / "batch_import.py"
+sys.path.insert(0, str(BENCH_DIR))
+
+import mock_server
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent importers sharing one AmbientCG cache")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"))
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--assets", type=int, default=6, help="Assets every process imports")
+    parser.add_argument("--resolution", default="1K")
+    # Slow transfers make the importers overlap for longer
+    parser.add_argument("--bandwidth-kbps", type=int, default=2048)
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary cache and libraries")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp(prefix="ambientcg-shared-"))
+    cache_dir = workdir / "cache"
+    server, mock = mock_server.start_server(asset_count=args.assets, bandwidth=args.bandwidth_kbps * 1024)
+    env = dict(os.environ, AMBIENTCG_URL=mock.base_url)
+    ids = ",".join(mock.asset_ids)
+    started = time.perf_counter()
+    processes = [
+        subprocess.Popen(
+            [args.blender, "-b", "--factory-startup", "--python", str(BATCH_SCRIPT), "--",
+             "--ids", ids, "--resolution", args.resolution, "--cache-dir", str(cache_dir),
+             "--output", str(workdir / f"library_{i}.blend")],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+        for i in range(args.processes)
+    ]
+    failed = []
+    for i, process in enumerate(processes):
+        output, _ = process.communicate()
+        if process.returncode != 0 or not (workdir / f"library_{i}.blend").exists():
+            failed.append(i)
+            print(f"--- importer {i} exited with {process.returncode}\n{output}")
+    elapsed = time.perf_counter() - started
+    with mock.lock:
+        downloads = dict(mock.stats["downloads"])
+    server.shutdown()
+    expected = {f"{asset_id}_{args.resolution}-PNG.zip" for asset_id in mock.asset_ids}
+    duplicated = {name: count for name, count in downloads.items() if count != 1}
+    missing = sorted(expected.difference(downloads))
+    report = {
+        "processes": args.processes,
+        "seconds": elapsed,
+        "downloads": downloads,
+        "duplicated": duplicated,
+        "missing": missing,
+        "failed_importers": failed,
+        "passed": not (duplicated or missing or failed),
+    }
+    print(json.dumps(report, indent=2))
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    sys.exit(0 if report["passed"] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Quick check of the addon's non-UI code paths that runs under plain Python (only
+# `requests` is needed): bpy is replaced by stub_bpy and ambientcg.com by the mock server.
+#
+#   python benchmarks/smoke_test.py [--fixture benchmarks/fixtures/full_json.json]
+#
+# Covers the catalog client, the search index, resumed downloads, map extraction and the
+# thumbnail store. Exits non-zero on the first failed check.
+import os
+import sys
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import stub_bpy
+
+stub_bpy.install()
+
+import mock_server
+from run_benchmarks import load_addon
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AmbientCG addon smoke test without Blender")
+    parser.add_argument("--fixture", help="Recorded full_json response to serve instead of synthetic listings")
+    parser.add_argument("--assets", type=int, default=40)
+    return parser.parse_args()
+
+def check(condition, message):
+    if not condition:
+        raise AssertionError(message)
+    print(f"ok: {message}")
+
+def smoke_catalog(addon):
+    records, total = addon.get_catalog_client().search("", 0, 20)
+    check(records and total >= len(records), f"catalog returned {len(records)} of {total} assets")
+    check(all(record.type in addon.IMPORTABLE_DATA_TYPES for record in records), "catalog kept only importable assets")
+    return records
+
+def smoke_index(addon, records):
+    index = addon.get_catalog_index()
+    index.add_assets(records)
+    target = records[0]
+    found = index.search(target.id.lower())
+    check(any(record.id == target.id for record in found), f"index finds {target.id}")
+    addon.update_asset_search(target.id[:4])
+    check(any(item[0] == target.id for item in addon.draw_model), "search results reach the draw model")
+
+def smoke_download(addon, mock, asset_id):
+    # Half of the archive is left as a .part file, so the download has to resume it
+    name = f"{asset_id}_1K-PNG.zip"
+    data = mock.archive(name)
+    dest = addon.get_cache_dir() / f"{addon.get_asset_key(asset_id, '1K')}.zip"
+    part = dest.with_name(dest.name + ".part")
+    part.write_bytes(data[:len(data) // 2])
+    addon.download_file(f"{mock.base_url}/get?file={name}", dest)
+    check(dest.read_bytes() == data, "resumed download matches the archive")
+    check(mock.stats["requests"].get("archive_range") == 1, "download resumed with a Range request")
+    check(addon.archive_is_valid(dest), "downloaded archive passes verification")
+    return dest
+
+def smoke_extract(addon, zip_path):
+    extract_path = zip_path.with_suffix("")
+    shutil.rmtree(extract_path, ignore_errors=True)
+    maps = addon.get_wanted_maps()
+    written = addon.extract_maps(zip_path, extract_path, maps)
+    check(written, f"extracted {len(written)} maps")
+    check(not addon.get_missing_maps(extract_path, maps), "extracted folder has every wanted map")
+    check(addon.get_missing_maps(extract_path, maps, prefer_exr=True) == ["Displacement"],
+          "EXR preference asks for the EXR displacement")
+    addon.extract_maps(zip_path, extract_path, ["Displacement"], prefer_exr=True)
+    check(addon.find_map_files(extract_path, True)["Displacement"].endswith(".exr"), "EXR displacement extracted")
+
+def smoke_thumbnails(addon, records):
+    urls = [record.thumbnail for record in records[:5]]
+    for url in urls:
+        addon.download_preview_async(url)
+    store = addon.get_thumbnail_store()
+    check(all(store.get(url) is not None for url in urls), "thumbnails stored in the pack")
+    # The index is only written on save, as unregister does
+    store.save()
+    store.close_map()
+    addon.thumbnail_store = None
+    check(all(addon.get_thumbnail_store().get(url) is not None for url in urls), "thumbnail pack reopens")
+    check(all(addon.load_cached_preview(url) for url in urls), "stored thumbnails load as previews")
+
+def main():
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp(prefix="ambientcg-smoke-"))
+    server, mock = mock_server.start_server(asset_count=args.assets, fixture=args.fixture)
+    # Both are read when the addon module is imported
+    os.environ["AMBIENTCG_URL"] = mock.base_url
+    os.environ["AMBIENTCG_CACHE_DIR"] = str(workdir / "cache")
+    addon = load_addon()
+    addon.register()
+    try:
+        records = smoke_catalog(addon)
+        smoke_index(addon, records)
+        zip_path = smoke_download(addon, mock, records[0].id)
+        smoke_extract(addon, zip_path)
+        smoke_thumbnails(addon, records)
+    except AssertionError as e:
+        print(f"FAILED: {e}")
+        return 1
+    finally:
+        addon.unregister()
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print("smoke test passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
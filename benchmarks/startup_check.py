@@ -0,0 +1,112 @@
+# Startup check under plain Python (stub bpy, like smoke_test.py): register() must return
+# quickly however bad the connection is, with the panel showing "Refreshing catalog..."
+# until the background refresh gives up and reports the catalog as offline.
+#
+#   python benchmarks/startup_check.py [--bound-ms 500]
+#
+# Scenarios: an endpoint that refuses connections, one slower than the request timeout,
+# and a slow one that still answers.
+import os
+import sys
+import time
+import socket
+import shutil
+import tempfile
+import argparse
+from pathlib import Path
+from types import SimpleNamespace
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+import stub_bpy
+
+bpy = stub_bpy.install()
+
+import mock_server
+from run_benchmarks import load_addon, NullLayout
+
+REFRESHING_LABEL = "Refreshing catalog..."
+OFFLINE_LABEL = "Catalog unavailable (offline?)"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="AmbientCG addon startup check without Blender")
+    parser.add_argument("--bound-ms", type=float, default=500.0, help="Longest register() may take")
+    parser.add_argument("--latency-ms", type=float, default=1500.0, help="Delay of the slow endpoints")
+    return parser.parse_args()
+
+class RecordingLayout(NullLayout):
+    # Collects label texts from every nested layout of one panel draw
+    def __init__(self, labels=None):
+        self.labels = [] if labels is None else labels
+
+    def element(self, *args, **kwargs):
+        return RecordingLayout(self.labels)
+
+    def label(self, text="", **kwargs):
+        self.labels.append(text)
+
+def panel_labels(addon):
+    layout = RecordingLayout()
+    addon.ASSET_PT_Menu.draw(SimpleNamespace(layout=layout), bpy.context)
+    return layout.labels
+
+def refused_url():
+    # A port that was free a moment ago: connecting to it is refused straight away
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+def run_scenario(name, base_url, bound_ms, request_timeout=None, expect_offline=True):
+    workdir = Path(tempfile.mkdtemp(prefix="ambientcg-startup-"))
+    os.environ["AMBIENTCG_URL"] = base_url
+    os.environ["AMBIENTCG_CACHE_DIR"] = str(workdir / "cache")
+    bpy.app.timers.registered.clear()
+    addon = load_addon()
+    if request_timeout is not None:
+        addon.REQUEST_TIMEOUT = request_timeout
+    failures = []
+    try:
+        started = time.perf_counter()
+        addon.register()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"{name}: register() took {elapsed_ms:.1f} ms")
+        if elapsed_ms > bound_ms:
+            failures.append(f"register() took {elapsed_ms:.1f} ms, over {bound_ms:.0f} ms")
+        if not addon.catalog_refreshing or REFRESHING_LABEL not in panel_labels(addon):
+            failures.append("panel doesn't show the refresh in progress")
+        # Drive the timer by hand, as Blender would
+        while addon.apply_catalog_refresh() is not None:
+            time.sleep(0.05)
+        labels = panel_labels(addon)
+        if addon.catalog_refreshing or REFRESHING_LABEL in labels:
+            failures.append("panel still shows the refresh after it finished")
+        if expect_offline and OFFLINE_LABEL not in labels:
+            failures.append(f"panel doesn't report the catalog as offline: {labels}")
+        if not expect_offline and (OFFLINE_LABEL in labels or addon.catalog_refresh_error):
+            failures.append(f"slow endpoint failed the refresh: {addon.catalog_refresh_error}")
+    finally:
+        addon.unregister()
+        shutil.rmtree(workdir, ignore_errors=True)
+    for failure in failures:
+        print(f"{name}: FAILED: {failure}")
+    return not failures
+
+def main():
+    args = parse_args()
+    latency = args.latency_ms / 1000.0
+    server, mock = mock_server.start_server(asset_count=200, latency=latency)
+    try:
+        results = [
+            run_scenario("refused", refused_url(), args.bound_ms),
+            run_scenario("timeout", mock.base_url, args.bound_ms, request_timeout=latency / 3),
+            run_scenario("slow", mock.base_url, args.bound_ms, expect_offline=False),
+        ]
+    finally:
+        server.shutdown()
+    print("startup check passed" if all(results) else "startup check failed")
+    return 0 if all(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+# Minimal stand-in for the bpy modules the addon touches, so its non-UI code paths can run
+# under plain Python. Only what the smoke test exercises is modelled.
+import sys
+import types
+
+class _Timers:
+    def __init__(self):
+        self.registered = {}
+
+    def register(self, fn, first_interval=0.0, persistent=False):
+        self.registered[fn] = first_interval
+
+    def unregister(self, fn):
+        self.registered.pop(fn, None)
+
+    def is_registered(self, fn):
+        return fn in self.registered
+
+class _Array(list):
+    def foreach_get(self, target):
+        target[:] = type(target)(target.typecode, self)
+
+    def foreach_set(self, source):
+        self[:] = list(source)
+
+class ImagePreview:
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.icon_id = id(self) & 0xFFFF
+        self._size = (0, 0)
+        self.image_pixels = _Array()
+        if filepath:
+            # Stand-in for Blender decoding the file: a fixed 4x4 icon
+            with open(filepath, "rb") as f:
+                f.read()
+            self.image_size = (4, 4)
+            self.image_pixels[:] = [0x7F7F7FFF] * 16
+
+    @property
+    def image_size(self):
+        return self._size
+
+    @image_size.setter
+    def image_size(self, value):
+        self._size = tuple(value)
+
+class ImagePreviewCollection(dict):
+    def new(self, name):
+        preview = self[name] = ImagePreview()
+        return preview
+
+    def load(self, name, filepath, filetype, force_reload=False):
+        preview = self[name] = ImagePreview(filepath)
+        return preview
+
+def _previews_new():
+    return ImagePreviewCollection()
+
+def _previews_remove(pcoll):
+    pcoll.clear()
+
+class _Struct:
+    # Base for Operator/Panel/AddonPreferences/Scene
+    def report(self, kind, message):
+        print(f"{sorted(kind)[0]}: {message}")
+
+def _prop(*args, **kwargs):
+    return kwargs.get("default")
+
+def install():
+    if "bpy" in sys.modules:
+        return sys.modules["bpy"]
+    bpy = types.ModuleType("bpy")
+    bpy.types = types.SimpleNamespace(
+        Operator=_Struct, Panel=_Struct, AddonPreferences=_Struct, Scene=_Struct,
+    )
+    bpy.props = types.SimpleNamespace(**{
+        name: _prop for name in ("StringProperty", "IntProperty", "FloatProperty", "BoolProperty", "EnumProperty")
+    })
+    previews = types.ModuleType("bpy.utils.previews")
+    previews.new = _previews_new
+    previews.remove = _previews_remove
+    utils = types.ModuleType("bpy.utils")
+    utils.previews = previews
+    utils.register_class = lambda cls: None
+    utils.unregister_class = lambda cls: None
+    bpy.utils = utils
+    bpy.app = types.SimpleNamespace(timers=_Timers(), version_string="stub")
+    scene = types.SimpleNamespace(ambientcg_resolution="1K", ambientcg_progressive=False, ambientcg_search_query="")
+    bpy.context = types.SimpleNamespace(
+        window_manager=None, scene=scene,
+        preferences=types.SimpleNamespace(addons={}),
+    )
+    bpy.data = types.SimpleNamespace(materials={}, images=[], objects={})
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy_extras = types.ModuleType("bpy_extras")
+    io_utils = types.ModuleType("bpy_extras.io_utils")
+    io_utils.ExportHelper = type("ExportHelper", (), {})
+    bpy_extras.io_utils = io_utils
+    sys.modules.update({
+        "bpy": bpy, "bpy.utils": utils, "bpy.utils.previews": previews,
+        "bpy_extras": bpy_extras, "bpy_extras.io_utils": io_utils,
+    })
+    return bpy